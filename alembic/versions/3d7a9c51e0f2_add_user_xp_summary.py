@@ -0,0 +1,90 @@
+"""add user xp summary
+
+Revision ID: 3d7a9c51e0f2
+Revises: 8c1f4e2a9b37
+Create Date: 2026-10-16 11:40:00.000000
+
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d7a9c51e0f2'
+down_revision: Union[str, Sequence[str], None] = '8c1f4e2a9b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+XP_PER_LEVEL = 100
+RECENT_EVENT_LIMIT = 5
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    summary_table = op.create_table(
+        "user_xp_summary",
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("user.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("total_xp", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("level", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("recent_events", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+    # Backfill from the ledger; mirrors app.core.xp_summary.rebuild_xp_summaries.
+    bind = op.get_bind()
+    user_table = sa.table("user", sa.column("id", sa.Integer()))
+    xp_table = sa.table(
+        "xp_event",
+        sa.column("id", sa.Integer()),
+        sa.column("user_id", sa.Integer()),
+        sa.column("delta", sa.Integer()),
+        sa.column("reason", sa.String()),
+        sa.column("created_at", sa.DateTime()),
+    )
+
+    totals: dict[int, int] = defaultdict(int)
+    recent: dict[int, list[dict]] = defaultdict(list)
+    rows = bind.execute(
+        sa.select(
+            xp_table.c.user_id,
+            xp_table.c.delta,
+            xp_table.c.reason,
+            xp_table.c.created_at,
+        ).order_by(xp_table.c.created_at.desc(), xp_table.c.id.desc())
+    )
+    for user_id, delta, reason, created_at in rows:
+        totals[user_id] += delta
+        if len(recent[user_id]) < RECENT_EVENT_LIMIT:
+            recent[user_id].append(
+                {"reason": reason, "delta": delta, "created_at": created_at.isoformat()}
+            )
+
+    now = datetime.utcnow()
+    summaries = [
+        {
+            "user_id": user_id,
+            "total_xp": totals[user_id],
+            "level": max(totals[user_id], 0) // XP_PER_LEVEL,
+            "recent_events": recent[user_id],
+            "updated_at": now,
+        }
+        for (user_id,) in bind.execute(sa.select(user_table.c.id))
+    ]
+    if summaries:
+        op.bulk_insert(summary_table, summaries)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_table("user_xp_summary")
@@ -0,0 +1,39 @@
+"""add device token version
+
+Revision ID: 8c1f4e2a9b37
+Revises: 274e47a135b1
+Create Date: 2026-10-16 09:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4e2a9b37'
+down_revision: Union[str, Sequence[str], None] = '274e47a135b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    with op.batch_alter_table("device") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "token_version",
+                sa.Integer(),
+                nullable=False,
+                server_default=sa.text("1"),
+            )
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    with op.batch_alter_table("device") as batch_op:
+        batch_op.drop_column("token_version")
@@ -0,0 +1,35 @@
+"""add data generation counter
+
+Revision ID: b5e2f0c8d413
+Revises: 3d7a9c51e0f2
+Create Date: 2026-10-16 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2f0c8d413'
+down_revision: Union[str, Sequence[str], None] = '3d7a9c51e0f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    generation_table = op.create_table(
+        "data_generation",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.bulk_insert(generation_table, [{"id": 1, "value": 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_table("data_generation")
@@ -0,0 +1,83 @@
+"""add progress counters
+
+Revision ID: e7b3c2d94a61
+Revises: b5e2f0c8d413
+Create Date: 2026-10-16 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3c2d94a61'
+down_revision: Union[str, Sequence[str], None] = 'b5e2f0c8d413'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PLAN_DAY_COUNTERS = ("approved_count", "total_count")
+PLAN_COUNTERS = ("approved_count", "total_count", "completed_day_count", "day_count")
+
+
+def _counter_column(name: str) -> sa.Column:
+    return sa.Column(name, sa.Integer(), nullable=False, server_default=sa.text("0"))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    with op.batch_alter_table("plan_day") as batch_op:
+        for name in PLAN_DAY_COUNTERS:
+            batch_op.add_column(_counter_column(name))
+    with op.batch_alter_table("plan") as batch_op:
+        for name in PLAN_COUNTERS:
+            batch_op.add_column(_counter_column(name))
+
+    # Backfill; mirrors app.core.progress_counters.recount_progress. The ORM
+    # stores enum names, the original schema's defaults use values.
+    op.execute(
+        """
+        UPDATE plan_day SET
+            total_count = (
+                SELECT count(*) FROM subtask WHERE subtask.plan_day_id = plan_day.id
+            ),
+            approved_count = (
+                SELECT count(*) FROM subtask
+                WHERE subtask.plan_day_id = plan_day.id AND lower(subtask.status) = 'approved'
+            )
+        """
+    )
+    op.execute(
+        """
+        UPDATE plan SET
+            approved_count = (
+                SELECT coalesce(sum(approved_count), 0) FROM plan_day
+                WHERE plan_day.plan_id = plan.id
+            ),
+            total_count = (
+                SELECT coalesce(sum(total_count), 0) FROM plan_day
+                WHERE plan_day.plan_id = plan.id
+            ),
+            completed_day_count = (
+                SELECT count(*) FROM plan_day
+                WHERE plan_day.plan_id = plan.id
+                    AND plan_day.approved_count = plan_day.total_count
+            ),
+            day_count = (
+                SELECT count(*) FROM plan_day WHERE plan_day.plan_id = plan.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    with op.batch_alter_table("plan") as batch_op:
+        for name in PLAN_COUNTERS:
+            batch_op.drop_column(name)
+    with op.batch_alter_table("plan_day") as batch_op:
+        for name in PLAN_DAY_COUNTERS:
+            batch_op.drop_column(name)
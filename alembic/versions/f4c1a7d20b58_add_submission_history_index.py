@@ -0,0 +1,35 @@
+"""add submission history index
+
+Revision ID: f4c1a7d20b58
+Revises: e7b3c2d94a61
+Create Date: 2026-10-16 18:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c1a7d20b58'
+down_revision: Union[str, Sequence[str], None] = 'e7b3c2d94a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    # Serves the latest-submission window and the keyset-paginated history.
+    op.create_index(
+        "ix_subtask_submission_subtask_created",
+        "subtask_submission",
+        ["subtask_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+
+    op.drop_index("ix_subtask_submission_subtask_created", table_name="subtask_submission")
@@ -20,7 +20,13 @@ from sqlmodel import Session, select
 
 from app.core.activity_log import log_activity
 from app.core.db import get_session
+from app.core.device import materialize_device
+from app.core.device_cache import DeviceSnapshot, device_cache
+from app.core.events import event_broadcaster
+from app.core.fragments import fragment_cache
+from app.core.generation import context_cache
 from app.core.markdown_import import import_markdown_plan
+from app.core.query_stats import query_metrics
 from app.models.activity import ActivityLog
 from app.models.devices import Device
 from app.models.users import User
@@ -189,6 +195,8 @@ def rename_device(
             },
         )
         session.commit()
+        device_cache.put(DeviceSnapshot.from_device(device))
+        event_broadcaster.publish("devicesUpdated", {"device_id": device.id})
 
     return RedirectResponse(url=router.url_path_for("devices"), status_code=303)
 
@@ -217,6 +225,7 @@ def link_device_user(
     if device.linked_user_id != target_user_id:
         previous_user_id = device.linked_user_id
         device.linked_user_id = target_user_id
+        device.token_version += 1
         session.add(device)
         session.flush()
 
@@ -241,10 +250,25 @@ def link_device_user(
             metadata=log_metadata,
         )
         session.commit()
+        device_cache.put(DeviceSnapshot.from_device(device))
+        event_broadcaster.publish("devicesUpdated", {"device_id": device.id})
 
     return RedirectResponse(url=router.url_path_for("devices"), status_code=303)
 
 
+@router.get("/metrics")
+def metrics() -> dict[str, object]:
+    """Return in-process cache and per-route query counters for diagnostics."""
+
+    return {
+        "device_cache": device_cache.stats(),
+        "context_cache": context_cache.stats(),
+        "fragment_cache": fragment_cache.stats(),
+        "events": event_broadcaster.stats(),
+        "queries": query_metrics.snapshot(),
+    }
+
+
 @router.get("/activity", response_class=HTMLResponse)
 def activity_log(request: Request, session: Session = Depends(get_session)):
     """Render the activity log with filtering controls."""
@@ -307,7 +331,8 @@ async def import_md(
 ):
     """Import a markdown plan file."""
 
-    device = getattr(request.state, "device", None)
+    device_snapshot = getattr(request.state, "device", None)
+    device = materialize_device(session, device_snapshot)
     user = getattr(request.state, "user", None)
     metadata: dict[str, int | str | None] = {
         "filename": file.filename,
@@ -320,6 +345,7 @@ async def import_md(
         plan_id = import_markdown_plan(content, assignee_user_id, session)
     except UnicodeDecodeError as exc:
         session.rollback()
+        device = materialize_device(session, device_snapshot)
         error_detail = "Uploaded file must be valid UTF-8 text."
         metadata_with_error = {**metadata, "error": error_detail}
         log_activity(
@@ -335,6 +361,7 @@ async def import_md(
         raise HTTPException(status_code=400, detail=error_detail) from exc
     except ValueError as exc:
         session.rollback()
+        device = materialize_device(session, device_snapshot)
         error_detail = str(exc)
         metadata_with_error = {**metadata, "error": error_detail}
         log_activity(
@@ -359,5 +386,6 @@ async def import_md(
         user=user,
         commit=True,
     )
+    event_broadcaster.publish("planProgressUpdated", {"plan_id": plan_id, "day_id": None})
 
     return {"ok": True, "plan_id": plan_id}
@@ -0,0 +1,46 @@
+"""Server-Sent Events stream of domain events for open pages."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import Subscription, event_broadcaster, format_sse
+
+router = APIRouter()
+
+# Browsers reconnect after this many milliseconds when the stream drops.
+_RETRY_MS = 5000
+
+
+async def _event_stream(
+    request: Request, subscription: Subscription, heartbeat: float
+) -> AsyncIterator[str]:
+    try:
+        yield f"retry: {_RETRY_MS}\n\n"
+        while True:
+            batch = await subscription.next_batch(heartbeat)
+            if batch is None or await request.is_disconnected():
+                break
+            if not batch:
+                # Comment line: keeps proxies from timing out an idle stream.
+                yield ": keepalive\n\n"
+                continue
+            yield "".join(format_sse(name, data) for name, data in batch)
+    finally:
+        event_broadcaster.unsubscribe(subscription)
+
+
+@router.get("/events")
+async def events(request: Request) -> StreamingResponse:
+    """Stream ``planProgressUpdated``/``reviewQueueRefresh`` events to the page."""
+
+    subscription = event_broadcaster.subscribe()
+    return StreamingResponse(
+        _event_stream(request, subscription, settings.events_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import json
 from collections import defaultdict
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
@@ -17,79 +17,185 @@ from fastapi import (
     UploadFile,
     status,
 )
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.activity_log import log_activity
 from app.core.config import settings
-from app.core.db import get_session
-from app.core.locking import PlanProgress, ProgressCache, refresh_plan_day_locks
-from app.core.xp import calculate_user_total_xp, progress_for_total_xp, reason_label
+from app.core.db import get_async_session, get_session
+from app.core.device import materialize_device
+from app.core.etag import conditional_headers, etag_matches, make_etag, not_modified
+from app.core.events import CLIENT_ID_HEADER, event_broadcaster
+from app.core.fragments import register_fragment_cache
+from app.core.generation import context_cache, current_generation
+from app.core.locking import PlanProgress, refresh_plan_day_locks
+from app.core.progress_counters import (
+    day_progress_from_counters,
+    plan_progress_from_counters,
+    record_status_change,
+)
+from app.core.submission_queries import SUBMISSIONS_NEWEST_FIRST, latest_submissions
+from app.core.xp import progress_for_total_xp
+from app.core.xp_summary import xp_history
 from app.models.attachments import Attachment
 from app.models.devices import Device
 from app.models.plans import Plan, PlanStatus
 from app.models.tasks import PlanDay, Subtask, SubtaskStatus, SubtaskSubmission
 from app.models.users import User
+from app.models.xp import UserXPSummary
 from app.core.imaging import process_image
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
+register_fragment_cache(templates)
+
+
+def _is_htmx_request(request: Request) -> bool:
+    """Return ``True`` when the incoming request originates from HTMX."""
+
+    return request.headers.get("HX-Request") == "true"
+
+
+def _percent(part: int, whole: int) -> int:
+    return 0 if whole == 0 else round((part / whole) * 100)
+
+
+def _build_board_summary(session: Session) -> dict:
+    """Return the family totals for the ``plan-summary`` partial.
+
+    Only counts and aggregates are queried; no user, plan or device rows are
+    loaded.
+    """
+
+    active_users = select(User.id).where(User.is_active.is_(True))
+    user_count, device_count, family_total_xp = session.exec(
+        select(
+            select(func.count()).select_from(active_users.subquery()).scalar_subquery(),
+            select(func.count(Device.id)).scalar_subquery(),
+            select(func.coalesce(func.sum(UserXPSummary.total_xp), 0))
+            .where(UserXPSummary.user_id.in_(active_users))
+            .scalar_subquery(),
+        )
+    ).one()
+    plans_by_status = dict(
+        session.exec(select(Plan.status, func.count(Plan.id)).group_by(Plan.status)).all()
+    )
+    active_approved, active_total, active_days_complete, active_days_total = session.exec(
+        select(
+            func.coalesce(func.sum(Plan.approved_count), 0),
+            func.coalesce(func.sum(Plan.total_count), 0),
+            func.coalesce(func.sum(Plan.completed_day_count), 0),
+            func.coalesce(func.sum(Plan.day_count), 0),
+        ).where(Plan.status == PlanStatus.IN_PROGRESS)
+    ).one()
+
+    board_totals = {
+        "user_count": user_count,
+        "plan_count": sum(plans_by_status.values()),
+        "active_plan_count": plans_by_status.get(PlanStatus.IN_PROGRESS, 0),
+        "completed_plan_count": plans_by_status.get(PlanStatus.COMPLETE, 0),
+        "device_count": device_count,
+        "family_total_xp": family_total_xp,
+        "active_plan_progress": {
+            "approved_subtasks": active_approved,
+            "total_subtasks": active_total,
+            "percent": _percent(active_approved, active_total),
+            "completed_days": active_days_complete,
+            "total_days": active_days_total,
+            "day_percent": _percent(active_days_complete, active_days_total),
+        },
+    }
+
+    return {
+        "totals": board_totals,
+        "has_any_plans": board_totals["plan_count"] > 0,
+        "has_any_users": user_count > 0,
+    }
+
+
+def _board_current_plans(session: Session) -> dict[int, Plan]:
+    """Return each member's card plan, keyed by assignee.
+
+    That is the most recently updated in-progress plan, or failing that the
+    most recently updated plan that is not archived. The window function
+    keeps this to one row per member however long the plan history grows.
+    """
+
+    ranked = (
+        select(
+            Plan.id,
+            func.row_number()
+            .over(
+                partition_by=Plan.assignee_user_id,
+                order_by=(
+                    (Plan.status == PlanStatus.IN_PROGRESS).desc(),
+                    func.coalesce(Plan.updated_at, Plan.created_at).desc(),
+                    Plan.created_at.desc(),
+                    Plan.id.desc(),
+                ),
+            )
+            .label("position"),
+        )
+        .where(Plan.status != PlanStatus.ARCHIVED)
+        .subquery()
+    )
+    plans = session.exec(
+        select(Plan).join(ranked, ranked.c.id == Plan.id).where(ranked.c.position == 1)
+    ).all()
+    return {plan.assignee_user_id: plan for plan in plans}
+
+
+def _plan_card_version(plan: Plan | None) -> tuple | None:
+    if plan is None:
+        return None
+    return (
+        plan.id,
+        plan.updated_at,
+        plan.status,
+        plan.total_xp,
+        plan.approved_count,
+        plan.total_count,
+        plan.completed_day_count,
+        plan.day_count,
+    )
 
 
-def _build_board_context(session: Session) -> dict:
-    """Aggregate board data for rendering and HTMX partials."""
+def _build_board_user_cards(session: Session) -> dict:
+    """Return the per-member cards for the ``user-cards`` partial."""
 
-    progress_cache = ProgressCache()
     users = session.exec(
-        select(User)
-        .where(User.is_active.is_(True))
-        .options(selectinload(User.xp_events))
-        .order_by(User.display_name)
+        select(User).where(User.is_active.is_(True)).order_by(User.display_name)
     ).all()
-    plan_stmt = (
-        select(Plan)
-        .order_by(Plan.created_at.desc())
-        .options(
-            selectinload(Plan.assignee),
-            selectinload(Plan.days).selectinload(PlanDay.subtasks),
+    xp_summaries = {
+        summary.user_id: summary for summary in session.exec(select(UserXPSummary))
+    }
+    current_plans = _board_current_plans(session)
+    plan_counts: dict[int, dict[PlanStatus, int]] = defaultdict(dict)
+    for assignee_id, plan_status, count in session.exec(
+        select(Plan.assignee_user_id, Plan.status, func.count(Plan.id)).group_by(
+            Plan.assignee_user_id, Plan.status
         )
+    ):
+        plan_counts[assignee_id][plan_status] = count
+    device_counts = dict(
+        session.exec(
+            select(Device.linked_user_id, func.count(Device.id))
+            .where(Device.linked_user_id.is_not(None))
+            .group_by(Device.linked_user_id)
+        ).all()
     )
-    plans = session.exec(plan_stmt).all()
-    devices = session.exec(select(Device)).all()
-
-    plans_by_user: dict[int, list[Plan]] = defaultdict(list)
-    for plan in plans:
-        plans_by_user[plan.assignee_user_id].append(plan)
-
-    active_approved = 0
-    active_total = 0
-    active_days_complete = 0
-    active_days_total = 0
-    plan_progress_map: dict[int, PlanProgress] = {}
-
-    for plan in plans:
-        progress = progress_cache.plan_progress(plan)
-        if plan.id is not None:
-            plan_progress_map[plan.id] = progress
-        if plan.status == PlanStatus.IN_PROGRESS:
-            active_approved += progress.approved_subtasks
-            active_total += progress.total_subtasks
-            active_days_complete += progress.completed_days
-            active_days_total += progress.total_days
 
     board_users: list[dict] = []
-    family_total_xp = 0
 
     for user in users:
-        user_plans = plans_by_user.get(user.id, [])
-        active_plans = [plan for plan in user_plans if plan.status == PlanStatus.IN_PROGRESS]
-        completed_plans = [plan for plan in user_plans if plan.status == PlanStatus.COMPLETE]
+        counts_by_status = plan_counts.get(user.id, {})
 
-        xp_events = sorted(user.xp_events, key=lambda event: event.created_at, reverse=True)
-        total_xp = calculate_user_total_xp(xp_events)
-        family_total_xp += total_xp
+        xp_summary = xp_summaries.get(user.id)
+        total_xp = xp_summary.total_xp if xp_summary is not None else 0
 
         progress = progress_for_total_xp(total_xp)
         level = progress.level
@@ -97,43 +203,36 @@ def _build_board_context(session: Session) -> dict:
         xp_to_next_level = progress.xp_to_next_level
         progress_percent = progress.progress_percent
 
-        most_recent_plan: Plan | None = None
-        if active_plans:
-            most_recent_plan = max(
-                active_plans,
-                key=lambda plan: plan.updated_at or plan.created_at,
-            )
-        elif user_plans:
-            most_recent_plan = max(
-                user_plans,
-                key=lambda plan: plan.updated_at or plan.created_at,
-            )
-
+        most_recent_plan = current_plans.get(user.id)
         current_plan: dict | None = None
         if most_recent_plan is not None:
-            plan_progress = plan_progress_map.get(most_recent_plan.id, None)
+            plan_progress = plan_progress_from_counters(most_recent_plan)
             current_plan = {
                 "id": most_recent_plan.id,
                 "title": most_recent_plan.title,
                 "status": most_recent_plan.status.value.replace("_", " ").title(),
                 "total_xp": most_recent_plan.total_xp,
                 "is_active": most_recent_plan.status == PlanStatus.IN_PROGRESS,
-                "progress": None,
-            }
-            if plan_progress is not None:
-                current_plan["progress"] = {
+                "progress": {
                     "percent": plan_progress.percent_complete,
                     "approved_subtasks": plan_progress.approved_subtasks,
                     "total_subtasks": plan_progress.total_subtasks,
                     "completed_days": plan_progress.completed_days,
                     "total_days": plan_progress.total_days,
                     "day_percent": plan_progress.day_percent_complete,
-                }
-
-        linked_devices = [device for device in devices if device.linked_user_id == user.id]
+                },
+            }
 
         board_users.append(
             {
+                # Fragment cache version: the rows and aggregates the card renders.
+                "version": (
+                    user.updated_at,
+                    xp_summary.updated_at if xp_summary is not None else None,
+                    _plan_card_version(most_recent_plan),
+                    tuple(sorted(counts_by_status.items())),
+                    device_counts.get(user.id, 0),
+                ),
                 "id": user.id,
                 "display_name": user.display_name,
                 "avatar": user.avatar,
@@ -144,78 +243,70 @@ def _build_board_context(session: Session) -> dict:
                 "progress_percent": progress_percent,
                 "active_plan": current_plan,
                 "plan_counts": {
-                    "total": len(user_plans),
-                    "active": len(active_plans),
-                    "completed": len(completed_plans),
+                    "total": sum(counts_by_status.values()),
+                    "active": counts_by_status.get(PlanStatus.IN_PROGRESS, 0),
+                    "completed": counts_by_status.get(PlanStatus.COMPLETE, 0),
                 },
-                "device_count": len(linked_devices),
-                "xp_history": [
-                    {
-                        "reason": event.reason,
-                        "label": reason_label(event.reason),
-                        "delta": event.delta,
-                        "created_at": event.created_at,
-                    }
-                    for event in xp_events[:5]
-                ],
+                "device_count": device_counts.get(user.id, 0),
+                "xp_history": xp_history(xp_summary),
             }
         )
 
-    active_plan_count = sum(1 for plan in plans if plan.status == PlanStatus.IN_PROGRESS)
-    board_totals = {
-        "user_count": len(users),
-        "plan_count": len(plans),
-        "active_plan_count": active_plan_count,
-        "completed_plan_count": sum(
-            1 for plan in plans if plan.status == PlanStatus.COMPLETE
-        ),
-        "device_count": len(devices),
-        "family_total_xp": family_total_xp,
-        "active_plan_progress": {
-            "approved_subtasks": active_approved,
-            "total_subtasks": active_total,
-            "percent": 0
-            if active_total == 0
-            else round((active_approved / active_total) * 100),
-            "completed_days": active_days_complete,
-            "total_days": active_days_total,
-            "day_percent": 0
-            if active_days_total == 0
-            else round((active_days_complete / active_days_total) * 100),
-        },
-    }
+    return {"users": board_users}
+
+
+BOARD_PARTIALS: dict[str, tuple[str, Callable[[Session], dict]]] = {
+    "plan-summary": ("components/board_plan_summary.html", _build_board_summary),
+    "user-cards": ("components/board_user_cards.html", _build_board_user_cards),
+}
+
+
+def _cached_board_partial(
+    session: Session, partial: str, generation: int | None = None
+) -> dict:
+    """Return one partial's context, rebuilt only when the data generation moved."""
+
+    _, builder = BOARD_PARTIALS[partial]
+    return context_cache.get_or_build(
+        session, f"board:{partial}", builder, generation=generation
+    )
 
-    return {
-        "users": board_users,
-        "totals": board_totals,
-        "has_any_plans": board_totals["plan_count"] > 0,
-        "has_any_users": bool(board_users),
-    }
+
+def _cached_board_page(session: Session) -> dict:
+    """Return the merged context of every board partial for the full page."""
+
+    context: dict = {}
+    for partial in BOARD_PARTIALS:
+        context.update(_cached_board_partial(session, partial))
+    return context
 
 
 @router.get("/", response_class=HTMLResponse)
-def board(request: Request, session: Session = Depends(get_session)):
+async def board(request: Request, session: AsyncSession = Depends(get_async_session)):
     """Render the main family board view or HTMX fragments."""
 
     device = getattr(request.state, "device", None)
-    board_context = _build_board_context(session)
 
     partial = request.query_params.get("partial")
-    if request.headers.get("HX-Request") == "true" and partial:
-        template_name = {
-            "plan-summary": "components/board_plan_summary.html",
-            "user-cards": "components/board_user_cards.html",
-        }.get(partial)
-
-        if template_name:
-            return templates.TemplateResponse(
-                template_name,
-                {
-                    "request": request,
-                    "board": board_context,
-                },
-            )
+    if request.headers.get("HX-Request") == "true" and partial in BOARD_PARTIALS:
+        template_name, _ = BOARD_PARTIALS[partial]
+        generation = await session.run_sync(current_generation)
+        etag = make_etag("board", partial, generation)
+        if etag_matches(request, etag):
+            return not_modified(etag, vary="HX-Request")
+
+        board_context = await session.run_sync(_cached_board_partial, partial, generation)
+        response = templates.TemplateResponse(
+            template_name,
+            {
+                "request": request,
+                "board": board_context,
+            },
+        )
+        response.headers.update(conditional_headers(etag, vary="HX-Request"))
+        return response
 
+    board_context = await session.run_sync(_cached_board_page)
     return templates.TemplateResponse(
         "board.html",
         {
@@ -297,49 +388,77 @@ SUBTASK_STATUS_BADGES: dict[SubtaskStatus, str] = {
 }
 
 
-def _plan_detail_statement(plan_id: int):
-    """Return a select statement that eager-loads plan relationships."""
+def _plan_detail_statement(plan_id: int, *, with_subtasks: bool = False):
+    """Return a select statement for the plan page and its days.
+
+    Day headers render from the stored progress counters, so subtasks are
+    only loaded on request; each day's subtasks, submissions and attachments
+    are fetched by :func:`plan_day_partial` when the day is opened.
+    """
 
+    attachments = selectinload(Plan.attachments)
+    days = selectinload(Plan.days)
     return (
         select(Plan)
         .where(Plan.id == plan_id)
         .options(
             selectinload(Plan.assignee),
-            selectinload(Plan.attachments).selectinload(Attachment.uploaded_by_user),
-            selectinload(Plan.attachments).selectinload(Attachment.uploaded_by_device),
-            selectinload(Plan.days)
-            .selectinload(PlanDay.subtasks)
-            .selectinload(Subtask.submissions)
-            .selectinload(SubtaskSubmission.submitted_by_user),
-            selectinload(Plan.days)
-            .selectinload(PlanDay.subtasks)
-            .selectinload(Subtask.submissions)
-            .selectinload(SubtaskSubmission.submitted_by_device),
-            selectinload(Plan.days)
-            .selectinload(PlanDay.subtasks)
-            .selectinload(Subtask.attachments)
-            .selectinload(Attachment.uploaded_by_user),
-            selectinload(Plan.days)
-            .selectinload(PlanDay.subtasks)
-            .selectinload(Subtask.attachments)
-            .selectinload(Attachment.uploaded_by_device),
+            attachments.selectinload(Attachment.uploaded_by_user),
+            attachments.selectinload(Attachment.uploaded_by_device),
+            days.selectinload(PlanDay.subtasks) if with_subtasks else days,
         )
     )
 
 
-def _load_plan_for_render(session: Session, plan_id: int) -> Plan:
-    """Fetch a plan with all relationships and refresh locks if needed."""
+def _subtask_statement():
+    """Return a select statement for subtasks with their attachments.
 
-    stmt = _plan_detail_statement(plan_id)
-    plan = session.exec(stmt).one_or_none()
-    if plan is None:
-        raise HTTPException(status_code=404, detail="Plan not found")
+    Submissions are not loaded here: a row shows only the latest one (see
+    :func:`latest_submissions`) and pages older ones in on request.
+    """
+
+    attachments = selectinload(Subtask.attachments)
+    return select(Subtask).options(
+        attachments.selectinload(Attachment.uploaded_by_user),
+        attachments.selectinload(Attachment.uploaded_by_device),
+    )
+
+
+_SUBMITTER_LOAD_OPTIONS = (
+    selectinload(SubtaskSubmission.submitted_by_user),
+    selectinload(SubtaskSubmission.submitted_by_device),
+)
+
+
+SUBMISSION_PAGE_SIZE = 5
+
+
+def _subtask_contexts(
+    session: Session, plan_id: int, subtasks: list[Subtask]
+) -> list[dict[str, Any]]:
+    latest = latest_submissions(
+        session, [subtask.id for subtask in subtasks], *_SUBMITTER_LOAD_OPTIONS
+    )
+    return [
+        _subtask_context(subtask, plan_id, *latest.get(subtask.id, (None, 0)))
+        for subtask in subtasks
+    ]
 
-    if refresh_plan_day_locks(plan):
-        session.add(plan)
-        session.commit()
-        plan = session.exec(stmt).one()
 
+def _load_plan_for_render(
+    session: Session, plan_id: int, *, with_subtasks: bool = False
+) -> Plan:
+    """Fetch a plan with the relationships the plan page renders.
+
+    Read-only: lock flags and plan status are kept current by the write
+    routes (see :func:`refresh_plan_day_locks`), so rendering never writes.
+    """
+
+    plan = session.exec(
+        _plan_detail_statement(plan_id, with_subtasks=with_subtasks)
+    ).one_or_none()
+    if plan is None:
+        raise HTTPException(status_code=404, detail="Plan not found")
     return plan
 
 
@@ -383,42 +502,346 @@ def _render_plan_page(
     return templates.TemplateResponse("plan.html", context, status_code=status_code)
 
 
+def _load_plan_context(session: Session, plan_id: int) -> dict[str, Any]:
+    """Load ``plan_id`` and build its template context in one sync pass."""
+
+    return _build_plan_context(_load_plan_for_render(session, plan_id))
+
+
+def _load_plan_progress_context(session: Session, plan_id: int) -> dict[str, Any]:
+    """Build the progress overview context from the plan row alone.
+
+    The plan's stored counters and XP total cover everything the overview
+    renders, so no days, subtasks or attachments are loaded.
+    """
+
+    plan = session.get(Plan, plan_id)
+    if plan is None:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return {
+        "total_xp": plan.total_xp,
+        "progress": _progress_context(plan_progress_from_counters(plan)),
+    }
+
+
+def _plan_progress_etag(session: Session, plan_id: int) -> str:
+    """Return the progress cards' ETag from the plan's own counters.
+
+    Unlike the global data generation, writes to other plans, devices or
+    XP summaries leave it unchanged, so the 60s poll keeps getting ``304``.
+    """
+
+    plan = session.get(Plan, plan_id)
+    if plan is None:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return make_etag(
+        "plan-progress",
+        plan_id,
+        plan.total_xp,
+        plan.approved_count,
+        plan.total_count,
+        plan.completed_day_count,
+        plan.day_count,
+    )
+
+
 @router.get("/plan/{plan_id}/partials/progress", response_class=HTMLResponse)
-def plan_progress_partial(
-    plan_id: int, request: Request, session: Session = Depends(get_session)
+async def plan_progress_partial(
+    plan_id: int, request: Request, session: AsyncSession = Depends(get_async_session)
 ):
     """Return the plan overview progress cards for HTMX updates."""
 
-    plan = _load_plan_for_render(session, plan_id)
-    plan_context = _build_plan_context(plan)
-    return templates.TemplateResponse(
+    etag = await session.run_sync(_plan_progress_etag, plan_id)
+    if etag_matches(request, etag):
+        return not_modified(etag, vary="HX-Request")
+
+    plan_context = await session.run_sync(_load_plan_progress_context, plan_id)
+    response = templates.TemplateResponse(
         "components/plan_progress_overview.html",
         {
             "request": request,
             "plan": plan_context,
         },
     )
+    response.headers.update(conditional_headers(etag, vary="HX-Request"))
+    return response
+
+
+def _load_day_subtasks_context(session: Session, plan_id: int, day_id: int) -> dict[str, Any]:
+    """Load one day's subtasks with their history and build their context."""
+
+    day = session.get(PlanDay, day_id)
+    if day is None or day.plan_id != plan_id:
+        raise HTTPException(status_code=404, detail="Plan day not found")
+
+    subtasks = session.exec(
+        _subtask_statement()
+        .where(Subtask.plan_day_id == day_id)
+        .order_by(Subtask.order_index)
+    ).all()
+    return {
+        "day_locked": day.locked,
+        "subtasks": _subtask_contexts(session, plan_id, list(subtasks)),
+    }
+
+
+@router.get("/plan/{plan_id}/partials/days/{day_id}", response_class=HTMLResponse)
+async def plan_day_partial(
+    plan_id: int,
+    day_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Return one day's subtasks, submissions and attachments when it is opened."""
+
+    day_context = await session.run_sync(_load_day_subtasks_context, plan_id, day_id)
+    return templates.TemplateResponse(
+        "components/plan_day_subtasks.html",
+        {
+            "request": request,
+            **day_context,
+        },
+    )
+
+
+def _load_subtask_updates_context(
+    session: Session, plan_id: int, subtask_id: int
+) -> dict[str, Any]:
+    """Build the context for one subtask row, its day header and plan progress."""
+
+    subtask = session.exec(_subtask_statement().where(Subtask.id == subtask_id)).one_or_none()
+    if subtask is None or subtask.plan_day.plan_id != plan_id:
+        raise HTTPException(status_code=404, detail="Subtask not found")
+
+    day = subtask.plan_day
+    return {
+        "subtask": _subtask_contexts(session, plan_id, [subtask])[0],
+        "day": _day_context(day),
+        "day_locked": day.locked,
+        "plan": _load_plan_progress_context(session, plan_id),
+    }
+
+
+@router.get("/plan/{plan_id}/partials/subtasks/{subtask_id}", response_class=HTMLResponse)
+async def plan_subtask_partial(
+    plan_id: int,
+    subtask_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Return one subtask row, its day header and the plan progress as OOB swaps.
+
+    The plan page requests this when an event names a subtask, instead of
+    reloading every day.
+    """
+
+    updates_context = await session.run_sync(
+        _load_subtask_updates_context, plan_id, subtask_id
+    )
+    return templates.TemplateResponse(
+        "components/subtask_updates.html",
+        {
+            "request": request,
+            **updates_context,
+        },
+    )
+
+
+def _submission_page_url(plan_id: int, subtask_id: int, *, before: int) -> str:
+    path = router.url_path_for(
+        "subtask_submissions_partial", plan_id=plan_id, subtask_id=subtask_id
+    )
+    return f"{path}?before={before}"
+
+
+def _load_submission_page_context(
+    session: Session, plan_id: int, subtask_id: int, before: int
+) -> dict[str, Any]:
+    """Return the submissions of ``subtask_id`` older than submission ``before``.
+
+    Keyset pagination on ``(created_at, id)``: each page starts strictly
+    after the cursor row, so the cost does not grow with the page number.
+    """
+
+    subtask_plan_id = session.exec(
+        select(PlanDay.plan_id)
+        .join(Subtask, Subtask.plan_day_id == PlanDay.id)
+        .where(Subtask.id == subtask_id)
+    ).one_or_none()
+    if subtask_plan_id != plan_id:
+        raise HTTPException(status_code=404, detail="Subtask not found")
+
+    cursor = session.exec(
+        select(SubtaskSubmission.created_at, SubtaskSubmission.id).where(
+            SubtaskSubmission.id == before, SubtaskSubmission.subtask_id == subtask_id
+        )
+    ).one_or_none()
+    if cursor is None:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    submissions = session.exec(
+        select(SubtaskSubmission)
+        .options(*_SUBMITTER_LOAD_OPTIONS)
+        .where(
+            SubtaskSubmission.subtask_id == subtask_id,
+            tuple_(SubtaskSubmission.created_at, SubtaskSubmission.id) < tuple_(*cursor),
+        )
+        .order_by(*SUBMISSIONS_NEWEST_FIRST)
+        .limit(SUBMISSION_PAGE_SIZE + 1)
+    ).all()
+
+    page = submissions[:SUBMISSION_PAGE_SIZE]
+    next_url = None
+    if len(submissions) > SUBMISSION_PAGE_SIZE:
+        next_url = _submission_page_url(plan_id, subtask_id, before=page[-1].id)
+    return {
+        "submissions": [_submission_context(submission) for submission in page],
+        "next_url": next_url,
+    }
+
+
+@router.get(
+    "/plan/{plan_id}/partials/subtasks/{subtask_id}/submissions",
+    response_class=HTMLResponse,
+)
+async def subtask_submissions_partial(
+    plan_id: int,
+    subtask_id: int,
+    before: int,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Return the next page of a subtask's older submissions."""
+
+    page_context = await session.run_sync(
+        _load_submission_page_context, plan_id, subtask_id, before
+    )
+    return templates.TemplateResponse(
+        "components/subtask_submission_page.html",
+        {
+            "request": request,
+            **page_context,
+        },
+    )
+
+
+def _plan_days_etag(session: Session, plan_id: int) -> str:
+    """Return the day list's ETag from the rows its headers render.
+
+    Subtask rows load lazily per day and refresh on their own, so only the
+    day titles, lock state and counters can change the list itself.
+    """
+
+    rows = session.exec(
+        select(
+            Plan.id,
+            PlanDay.id,
+            PlanDay.day_index,
+            PlanDay.title,
+            PlanDay.locked,
+            PlanDay.approved_count,
+            PlanDay.total_count,
+        )
+        .outerjoin(PlanDay, PlanDay.plan_id == Plan.id)
+        .where(Plan.id == plan_id)
+        .order_by(PlanDay.day_index)
+    ).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return make_etag("plan-days", *(tuple(row) for row in rows))
 
 
 @router.get("/plan/{plan_id}/partials/days", response_class=HTMLResponse)
-def plan_days_partial(
-    plan_id: int, request: Request, session: Session = Depends(get_session)
+async def plan_days_partial(
+    plan_id: int, request: Request, session: AsyncSession = Depends(get_async_session)
 ):
     """Return the rendered plan days list for HTMX updates."""
 
-    plan = _load_plan_for_render(session, plan_id)
-    plan_context = _build_plan_context(plan)
-    return templates.TemplateResponse(
+    etag = await session.run_sync(_plan_days_etag, plan_id)
+    if etag_matches(request, etag):
+        return not_modified(etag, vary="HX-Request")
+
+    plan_context = await session.run_sync(_load_plan_context, plan_id)
+    response = templates.TemplateResponse(
         "components/plan_day_list.html",
         {
             "request": request,
             "plan": plan_context,
         },
     )
+    response.headers.update(conditional_headers(etag, vary="HX-Request"))
+    return response
+
+
+def _subtask_context(
+    subtask: Subtask,
+    plan_id: int,
+    latest_submission: SubtaskSubmission | None,
+    submission_count: int,
+) -> dict[str, Any]:
+    status_label = subtask.status.value.replace("_", " ").title()
+    attachments = [_attachment_context(attachment) for attachment in subtask.attachments]
+
+    older_submissions_url = None
+    if latest_submission is not None and submission_count > 1:
+        older_submissions_url = _submission_page_url(
+            plan_id, subtask.id, before=latest_submission.id
+        )
+
+    return {
+        "id": subtask.id,
+        "text": subtask.text,
+        "xp_value": subtask.xp_value,
+        "status": subtask.status.value,
+        "status_label": status_label,
+        "status_badge_class": SUBTASK_STATUS_BADGES[subtask.status],
+        "latest_submission": (
+            _submission_context(latest_submission) if latest_submission else None
+        ),
+        "older_submission_count": max(submission_count - 1, 0),
+        "older_submissions_url": older_submissions_url,
+        "attachments": attachments,
+        "can_submit": subtask.status in {SubtaskStatus.PENDING, SubtaskStatus.DENIED},
+        "can_review": subtask.status == SubtaskStatus.SUBMITTED,
+    }
+
+
+def _day_context(day: PlanDay) -> dict[str, Any]:
+    day_progress = day_progress_from_counters(day)
+    return {
+        # Fragment cache version: the row fields the day header renders.
+        "version": (day.title, day.locked, day.approved_count, day.total_count),
+        "id": day.id,
+        "index": day.day_index,
+        "title": day.title,
+        "locked": day.locked,
+        "complete": day_progress.is_complete,
+        "progress_percent": day_progress.percent_complete,
+        "completed_subtasks": day_progress.approved_subtasks,
+        "total_subtasks": day_progress.total_subtasks,
+        "progress": {
+            "percent": day_progress.percent_complete,
+            "approved_subtasks": day_progress.approved_subtasks,
+            "total_subtasks": day_progress.total_subtasks,
+        },
+        "subtasks_url": router.url_path_for(
+            "plan_day_partial", plan_id=day.plan_id, day_id=day.id
+        ),
+    }
+
+
+def _progress_context(plan_progress: PlanProgress) -> dict[str, Any]:
+    return {
+        "percent": plan_progress.percent_complete,
+        "approved_subtasks": plan_progress.approved_subtasks,
+        "total_subtasks": plan_progress.total_subtasks,
+        "completed_days": plan_progress.completed_days,
+        "total_days": plan_progress.total_days,
+        "day_percent": plan_progress.day_percent_complete,
+    }
 
 
 def _build_plan_context(plan: Plan) -> dict[str, Any]:
-    progress_cache = ProgressCache()
     days = sorted(plan.days, key=lambda day: day.day_index)
 
     plan_attachments = [_attachment_context(attachment) for attachment in plan.attachments]
@@ -426,56 +849,9 @@ def _build_plan_context(plan: Plan) -> dict[str, Any]:
     day_contexts: list[dict[str, Any]] = []
 
     for day in days:
-        subtasks = sorted(day.subtasks, key=lambda subtask: subtask.order_index)
-        subtask_contexts: list[dict[str, Any]] = []
-
-        for subtask in subtasks:
-            status_label = subtask.status.value.replace("_", " ").title()
-            submissions = sorted(
-                (_submission_context(submission) for submission in subtask.submissions),
-                key=lambda item: item["created_at"],
-                reverse=True,
-            )
-            attachments = [
-                _attachment_context(attachment) for attachment in subtask.attachments
-            ]
-
-            subtask_contexts.append(
-                {
-                    "id": subtask.id,
-                    "text": subtask.text,
-                    "xp_value": subtask.xp_value,
-                    "status": subtask.status.value,
-                    "status_label": status_label,
-                    "status_badge_class": SUBTASK_STATUS_BADGES[subtask.status],
-                    "submissions": submissions,
-                    "attachments": attachments,
-                    "can_submit": subtask.status in {SubtaskStatus.PENDING, SubtaskStatus.DENIED},
-                    "can_review": subtask.status == SubtaskStatus.SUBMITTED,
-                }
-            )
-
-        day_progress = progress_cache.day_progress(day)
-        day_contexts.append(
-            {
-                "id": day.id,
-                "index": day.day_index,
-                "title": day.title,
-                "locked": day.locked,
-                "complete": day_progress.is_complete,
-                "progress_percent": day_progress.percent_complete,
-                "completed_subtasks": day_progress.approved_subtasks,
-                "total_subtasks": day_progress.total_subtasks,
-                "progress": {
-                    "percent": day_progress.percent_complete,
-                    "approved_subtasks": day_progress.approved_subtasks,
-                    "total_subtasks": day_progress.total_subtasks,
-                },
-                "subtasks": subtask_contexts,
-            }
-        )
+        day_contexts.append(_day_context(day))
 
-    plan_progress = progress_cache.plan_progress(plan)
+    plan_progress = plan_progress_from_counters(plan)
 
     assignee = None
     if plan.assignee:
@@ -500,14 +876,7 @@ def _build_plan_context(plan: Plan) -> dict[str, Any]:
         "completed_subtasks": plan_progress.approved_subtasks,
         "total_subtasks": plan_progress.total_subtasks,
         "progress_percent": plan_progress.percent_complete,
-        "progress": {
-            "percent": plan_progress.percent_complete,
-            "approved_subtasks": plan_progress.approved_subtasks,
-            "total_subtasks": plan_progress.total_subtasks,
-            "completed_days": plan_progress.completed_days,
-            "total_days": plan_progress.total_days,
-            "day_percent": plan_progress.day_percent_complete,
-        },
+        "progress": _progress_context(plan_progress),
         "updated_at": plan.updated_at,
     }
 
@@ -531,7 +900,7 @@ async def submit_subtask(
 ):
     """Handle submission of subtask evidence including optional photo uploads."""
 
-    plan = _load_plan_for_render(session, plan_id)
+    plan = _load_plan_for_render(session, plan_id, with_subtasks=True)
 
     device = getattr(request.state, "device", None)
     if device is None:
@@ -628,11 +997,16 @@ async def submit_subtask(
             form_state,
         )
 
+    device = materialize_device(session, device)
+
     now = datetime.utcnow()
+    previous_status = subtask.status
     subtask.status = SubtaskStatus.SUBMITTED
     subtask.updated_at = now
+    record_status_change(session, subtask, previous_status)
     subtask.plan_day.updated_at = now
     plan.updated_at = now
+    locks_changed = refresh_plan_day_locks(plan)
 
     submission = SubtaskSubmission(
         subtask_id=subtask.id,
@@ -666,7 +1040,7 @@ async def submit_subtask(
             "plan_id": plan.id,
             "plan_title": plan.title,
             "subtask_id": subtask.id,
-            "subtask_title": subtask.title,
+            "subtask_title": subtask.text,
             "comment": trimmed_comment or None,
             "photo_path": saved["file"],
             "submitted_user_id": getattr(submitted_user, "id", None),
@@ -679,16 +1053,36 @@ async def submit_subtask(
 
     session.commit()
 
-    if _is_htmx_request(request):
-        trigger_payload = {
-            "planProgressUpdated": {
-                "plan_id": plan.id,
-                "day_id": getattr(subtask.plan_day, "id", None),
-            }
+    trigger_payload = {
+        "planProgressUpdated": {
+            "plan_id": plan.id,
+            "day_id": getattr(subtask.plan_day, "id", None),
+            "subtask_id": subtask.id,
+            "locks_changed": locks_changed,
         }
-        response = Response(status_code=status.HTTP_204_NO_CONTENT)
-        response.headers["HX-Trigger"] = json.dumps(trigger_payload)
-        return response
+    }
+    event_broadcaster.publish_many(
+        trigger_payload, origin=request.headers.get(CLIENT_ID_HEADER)
+    )
+
+    if _is_htmx_request(request):
+        # Swap the refreshed fragments in out of band instead of having the
+        # page re-request them. Only a lock change touches other days.
+        if locks_changed:
+            return templates.TemplateResponse(
+                "components/plan_oob_updates.html",
+                {
+                    "request": request,
+                    "plan": _load_plan_context(session, plan_id),
+                },
+            )
+        return templates.TemplateResponse(
+            "components/subtask_updates.html",
+            {
+                "request": request,
+                **_load_subtask_updates_context(session, plan_id, subtask.id),
+            },
+        )
 
     redirect_url = request.url_for("view_plan", plan_id=str(plan_id))
     return RedirectResponse(redirect_url, status_code=status.HTTP_303_SEE_OTHER)
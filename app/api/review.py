@@ -5,17 +5,27 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Iterable
 
-import json
-
-from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response, status
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
-
-from app.core.db import get_session
-from app.core.locking import ProgressCache
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import get_async_session, get_session
+from app.core.device import materialize_device, revalidate_device
+from app.core.device_cache import DeviceSnapshot
+from app.core.etag import conditional_headers, etag_matches, make_etag, not_modified
+from app.core.events import CLIENT_ID_HEADER, event_broadcaster
+from app.core.fragments import register_fragment_cache
+from app.core.generation import current_generation
 from app.core.locking import refresh_plan_day_locks
+from app.core.progress_counters import (
+    day_progress_from_counters,
+    plan_progress_from_counters,
+    record_status_change,
+)
+from app.core.submission_queries import latest_submissions
 from app.core.xp import (
     DAY_COMPLETION_BONUS,
     PLAN_COMPLETION_BONUS,
@@ -28,6 +38,7 @@ from app.core.xp import (
     is_plan_complete,
 )
 from app.core.activity_log import log_activity
+from app.core.xp_summary import record_xp_events
 from app.models.approvals import Approval, ApprovalAction, ApprovalMood
 from app.models.devices import Device
 from app.models.plans import Plan
@@ -37,6 +48,7 @@ from app.models.xp import XPEvent
 
 router = APIRouter(prefix="/review")
 templates = Jinja2Templates(directory="app/templates")
+register_fragment_cache(templates)
 
 _REVIEW_LOAD_OPTIONS: Iterable[Any] = (
     selectinload(Subtask.plan_day)
@@ -53,6 +65,20 @@ _REVIEW_LOAD_OPTIONS: Iterable[Any] = (
     .selectinload(Device.linked_user),
 )
 
+# The queue renders progress from the plan/day counters and shows only the
+# latest submission (see :func:`_queue_items`), so it loads neither the
+# plan's other days and subtasks nor the submission history.
+_QUEUE_LOAD_OPTIONS: Iterable[Any] = (
+    selectinload(Subtask.plan_day)
+    .selectinload(PlanDay.plan)
+    .selectinload(Plan.assignee),
+)
+
+_SUBMITTER_LOAD_OPTIONS: Iterable[Any] = (
+    selectinload(SubtaskSubmission.submitted_by_user),
+    selectinload(SubtaskSubmission.submitted_by_device).selectinload(Device.linked_user),
+)
+
 MOOD_OPTIONS: list[dict[str, str]] = [
     {"value": ApprovalMood.HAPPY.value, "label": "Happy"},
     {"value": ApprovalMood.NEUTRAL.value, "label": "Neutral"},
@@ -72,20 +98,19 @@ def _is_htmx_request(request: Request) -> bool:
 
 
 def _resolve_request_actor(
-    session: Session, request: Request
-) -> tuple[Device | None, User | None]:
-    """Return the acting device and user associated with the request."""
-
-    device_obj = getattr(request.state, "device", None)
-    acting_device: Device | None = None
-    if device_obj is not None:
-        acting_device = session.exec(
-            select(Device)
-            .where(Device.id == device_obj.id)
-            .options(selectinload(Device.linked_user))
-        ).one_or_none()
-        if acting_device is None:
-            acting_device = device_obj  # Fallback to detached instance for attrs
+    session: Session, request: Request, *, revalidate: bool = False
+) -> tuple[DeviceSnapshot | None, User | None]:
+    """Return the acting device and user associated with the request.
+
+    The device snapshot resolved by the cookie middleware already carries
+    ``linked_user_id``, which is all :func:`can_approve` needs, so read paths
+    issue no device query. Approve and deny pass ``revalidate=True`` so a
+    relink is honoured before the signed claims token expires.
+    """
+
+    acting_device: DeviceSnapshot | None = getattr(request.state, "device", None)
+    if revalidate and acting_device is not None:
+        acting_device = revalidate_device(session, acting_device)
 
     user_obj = getattr(request.state, "user", None)
     acting_user: User | None = None
@@ -95,7 +120,7 @@ def _resolve_request_actor(
     return acting_device, acting_user
 
 
-def _device_label(device: Device) -> str:
+def _device_label(device: Device | DeviceSnapshot) -> str:
     """Return a human-friendly label for a device."""
 
     if device.friendly_name:
@@ -103,22 +128,19 @@ def _device_label(device: Device) -> str:
     return f"Device {device.id}"
 
 
-def _device_context(device: Device | None) -> dict[str, Any] | None:
+def _device_context(
+    device: DeviceSnapshot | None, *, linked_user_name: str | None = None
+) -> dict[str, Any] | None:
     """Return a serialisable context payload for a device."""
 
     if device is None:
         return None
 
-    label = _device_label(device)
-    linked_name = None
-    if getattr(device, "linked_user", None):
-        linked_name = device.linked_user.display_name
-
     return {
         "id": device.id,
-        "label": label,
+        "label": _device_label(device),
         "friendly_name": device.friendly_name,
-        "linked_user_name": linked_name,
+        "linked_user_name": linked_user_name,
     }
 
 
@@ -161,7 +183,10 @@ def _submission_context(submission: SubtaskSubmission) -> dict[str, Any]:
 
 
 def can_approve(
-    subtask: Subtask, *, acting_user: User | None, acting_device: Device | None
+    subtask: Subtask,
+    *,
+    acting_user: User | None,
+    acting_device: Device | DeviceSnapshot | None,
 ) -> tuple[bool, str | None]:
     """Return whether the active actor can approve ``subtask``."""
 
@@ -182,14 +207,13 @@ def can_approve(
 
 def _build_queue_item(
     subtask: Subtask,
+    submission: SubtaskSubmission | None,
     *,
     acting_user: User | None,
-    acting_device: Device | None,
-    progress_cache: ProgressCache,
+    acting_device: DeviceSnapshot | None,
 ) -> dict[str, Any] | None:
     """Return a dictionary describing the queue entry for ``subtask``."""
 
-    submission = _latest_submission(subtask)
     if submission is None:
         return None
 
@@ -202,10 +226,28 @@ def _build_queue_item(
         subtask, acting_user=acting_user, acting_device=acting_device
     )
 
-    plan_progress = progress_cache.plan_progress(plan)
-    day_progress = progress_cache.day_progress(plan_day)
+    plan_progress = plan_progress_from_counters(plan)
+    day_progress = day_progress_from_counters(plan_day)
+    submission_context = _submission_context(submission)
 
     return {
+        # Fragment cache version: the rows and counters the entry renders.
+        "version": (
+            subtask.updated_at,
+            plan.updated_at,
+            plan.approved_count,
+            plan.total_count,
+            plan.completed_day_count,
+            plan.day_count,
+            plan_day.approved_count,
+            plan_day.total_count,
+            plan.assignee_user_id,
+            submission.id,
+            submission_context["submitted_by"],
+            submission_context["device_linked_user"],
+            allow,
+            message,
+        ),
         "subtask_id": subtask.id,
         "subtask_text": subtask.text,
         "xp_value": subtask.xp_value,
@@ -214,7 +256,7 @@ def _build_queue_item(
         "assignee_name": plan.assignee.display_name if plan.assignee else None,
         "day_number": plan_day.day_index + 1,
         "day_title": plan_day.title,
-        "latest_submission": _submission_context(submission),
+        "latest_submission": submission_context,
         "approval_allowed": allow,
         "approval_message": message,
         "plan_progress": {
@@ -237,26 +279,30 @@ def _queue_items(
     session: Session,
     *,
     acting_user: User | None,
-    acting_device: Device | None,
+    acting_device: DeviceSnapshot | None,
 ) -> list[dict[str, Any]]:
     """Return queue item dictionaries for pending subtasks."""
 
     stmt = (
-        _subtask_review_statement()
+        select(Subtask)
+        .options(*_QUEUE_LOAD_OPTIONS)
         .where(Subtask.status == SubtaskStatus.SUBMITTED)
         .order_by(Subtask.updated_at.desc())
     )
     subtasks = session.exec(stmt).all()
+    latest = latest_submissions(
+        session, [subtask.id for subtask in subtasks], *_SUBMITTER_LOAD_OPTIONS
+    )
 
     items: list[dict[str, Any]] = []
-    progress_cache = ProgressCache()
 
     for subtask in subtasks:
+        submission, _ = latest.get(subtask.id, (None, 0))
         item = _build_queue_item(
             subtask,
+            submission,
             acting_user=acting_user,
             acting_device=acting_device,
-            progress_cache=progress_cache,
         )
         if item:
             items.append(item)
@@ -264,45 +310,69 @@ def _queue_items(
     return items
 
 
-@router.get("", response_class=HTMLResponse)
-def queue(request: Request, session: Session = Depends(get_session)):
-    """Render the pending review queue."""
+def _queue_context(
+    session: Session, request: Request, *, include_linked_user: bool
+) -> dict[str, Any]:
+    """Build the queue template context, excluding the request itself."""
 
     acting_device, acting_user = _resolve_request_actor(session, request)
-
     items = _queue_items(
         session, acting_user=acting_user, acting_device=acting_device
     )
 
-    context = {
-        "request": request,
+    linked_user_name: str | None = None
+    if (
+        include_linked_user
+        and acting_device is not None
+        and acting_device.linked_user_id is not None
+    ):
+        linked_user = session.get(User, acting_device.linked_user_id)
+        linked_user_name = linked_user.display_name if linked_user else None
+
+    return {
         "items": items,
         "mood_options": MOOD_OPTIONS,
         "default_mood": ApprovalMood.NEUTRAL.value,
-        "device": _device_context(acting_device),
+        "device": _device_context(acting_device, linked_user_name=linked_user_name),
     }
 
+
+@router.get("", response_class=HTMLResponse)
+async def queue(request: Request, session: AsyncSession = Depends(get_async_session)):
+    """Render the pending review queue."""
+
+    context = await session.run_sync(_queue_context, request, include_linked_user=True)
+    context["request"] = request
+
     return templates.TemplateResponse("review.html", context)
 
 
 @router.get("/partials/queue", response_class=HTMLResponse)
-def queue_partial(request: Request, session: Session = Depends(get_session)):
+async def queue_partial(
+    request: Request, session: AsyncSession = Depends(get_async_session)
+):
     """Return the queue list fragment for HTMX updates."""
 
-    acting_device, acting_user = _resolve_request_actor(session, request)
-    items = _queue_items(
-        session, acting_user=acting_user, acting_device=acting_device
+    # Approval rights and the device banner depend on who is asking.
+    device = getattr(request.state, "device", None)
+    user = getattr(request.state, "user", None)
+    generation = await session.run_sync(current_generation)
+    etag = make_etag(
+        "review-queue",
+        generation,
+        getattr(device, "id", None),
+        getattr(device, "linked_user_id", None),
+        getattr(user, "id", None),
     )
+    if etag_matches(request, etag):
+        return not_modified(etag, vary="Cookie")
 
-    context = {
-        "request": request,
-        "items": items,
-        "mood_options": MOOD_OPTIONS,
-        "default_mood": ApprovalMood.NEUTRAL.value,
-        "device": _device_context(acting_device),
-    }
+    context = await session.run_sync(_queue_context, request, include_linked_user=False)
+    context["request"] = request
 
-    return templates.TemplateResponse("components/review_queue_items.html", context)
+    response = templates.TemplateResponse("components/review_queue_items.html", context)
+    response.headers.update(conditional_headers(etag, vary="Cookie"))
+    return response
 
 
 def _require_submission(
@@ -323,13 +393,23 @@ def _require_submission(
     return submission
 
 
-def _update_plan_state(plan: Plan) -> None:
-    """Refresh plan locking state and timestamps."""
+def _update_plan_state(plan: Plan) -> bool:
+    """Refresh plan locking state and timestamps; return whether locks changed."""
 
     now = datetime.utcnow()
     plan.updated_at = now
     if refresh_plan_day_locks(plan):
         plan.updated_at = datetime.utcnow()
+        return True
+    return False
+
+
+def _queue_oob_response(session: Session, request: Request) -> HTMLResponse:
+    """Return the refreshed queue as an out-of-band swap for the reviewer's page."""
+
+    context = _queue_context(session, request, include_linked_user=False)
+    context["request"] = request
+    return templates.TemplateResponse("components/review_queue_oob.html", context)
 
 
 @router.post("/subtask/{subtask_id}/approve")
@@ -343,7 +423,9 @@ def approve(
 ):
     """Approve the most recent submission for a subtask."""
 
-    acting_device, acting_user = _resolve_request_actor(session, request)
+    acting_device, acting_user = _resolve_request_actor(
+        session, request, revalidate=True
+    )
     if acting_device is None:
         raise HTTPException(status_code=400, detail="Device context is required for approvals.")
 
@@ -369,9 +451,13 @@ def approve(
     if plan is None:
         raise HTTPException(status_code=400, detail="Associated plan could not be loaded.")
 
+    acting_device = materialize_device(session, acting_device)
+
     now = datetime.utcnow()
+    previous_status = subtask.status
     subtask.status = SubtaskStatus.APPROVED
     subtask.updated_at = now
+    record_status_change(session, subtask, previous_status)
     if plan_day:
         plan_day.updated_at = now
 
@@ -400,7 +486,7 @@ def approve(
             )
         )
 
-    _update_plan_state(plan)
+    locks_changed = _update_plan_state(plan)
 
     day_is_complete = plan_day and is_day_complete(plan_day)
     if (
@@ -437,6 +523,7 @@ def approve(
 
     for event in xp_events:
         session.add(event)
+    record_xp_events(session, xp_events)
 
     session.add(subtask)
     session.add(plan)
@@ -466,17 +553,21 @@ def approve(
 
     session.commit()
 
+    trigger_payload = {
+        "reviewQueueRefresh": True,
+        "planProgressUpdated": {
+            "plan_id": plan.id,
+            "day_id": getattr(plan_day, "id", None),
+            "subtask_id": subtask.id,
+            "locks_changed": locks_changed,
+        },
+    }
+    event_broadcaster.publish_many(
+        trigger_payload, origin=request.headers.get(CLIENT_ID_HEADER)
+    )
+
     if _is_htmx_request(request):
-        trigger_payload = {
-            "reviewQueueRefresh": True,
-            "planProgressUpdated": {
-                "plan_id": plan.id,
-                "day_id": getattr(plan_day, "id", None),
-            },
-        }
-        response = Response(status_code=status.HTTP_204_NO_CONTENT)
-        response.headers["HX-Trigger"] = json.dumps(trigger_payload)
-        return response
+        return _queue_oob_response(session, request)
 
     return RedirectResponse(url=router.url_path_for("queue"), status_code=status.HTTP_303_SEE_OTHER)
 
@@ -492,7 +583,9 @@ def deny(
 ):
     """Deny the most recent submission for a subtask."""
 
-    acting_device, acting_user = _resolve_request_actor(session, request)
+    acting_device, acting_user = _resolve_request_actor(
+        session, request, revalidate=True
+    )
     if acting_device is None:
         raise HTTPException(status_code=400, detail="Device context is required for approvals.")
 
@@ -522,9 +615,13 @@ def deny(
     if not cleaned_reason:
         raise HTTPException(status_code=400, detail="A reason is required when denying submissions.")
 
+    acting_device = materialize_device(session, acting_device)
+
     now = datetime.utcnow()
+    previous_status = subtask.status
     subtask.status = SubtaskStatus.DENIED
     subtask.updated_at = now
+    record_status_change(session, subtask, previous_status)
     if plan_day:
         plan_day.updated_at = now
 
@@ -538,7 +635,7 @@ def deny(
     )
     session.add(approval)
 
-    _update_plan_state(plan)
+    locks_changed = _update_plan_state(plan)
 
     session.add(subtask)
     session.add(plan)
@@ -562,16 +659,20 @@ def deny(
 
     session.commit()
 
+    trigger_payload = {
+        "reviewQueueRefresh": True,
+        "planProgressUpdated": {
+            "plan_id": plan.id,
+            "day_id": getattr(plan_day, "id", None),
+            "subtask_id": subtask.id,
+            "locks_changed": locks_changed,
+        },
+    }
+    event_broadcaster.publish_many(
+        trigger_payload, origin=request.headers.get(CLIENT_ID_HEADER)
+    )
+
     if _is_htmx_request(request):
-        trigger_payload = {
-            "reviewQueueRefresh": True,
-            "planProgressUpdated": {
-                "plan_id": plan.id,
-                "day_id": getattr(plan_day, "id", None),
-            },
-        }
-        response = Response(status_code=status.HTTP_204_NO_CONTENT)
-        response.headers["HX-Trigger"] = json.dumps(trigger_payload)
-        return response
+        return _queue_oob_response(session, request)
 
     return RedirectResponse(url=router.url_path_for("queue"), status_code=status.HTTP_303_SEE_OTHER)
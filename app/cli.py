@@ -0,0 +1,112 @@
+"""Maintenance commands for the Family Portal database.
+
+Usage::
+
+    python -m app.cli xp-rebuild
+    python -m app.cli progress-check [--repair]
+    python -m app.cli locks-check [--repair]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+
+from sqlmodel import Session
+
+from app.core.db import engine
+
+
+def xp_rebuild(args: argparse.Namespace) -> int:
+    """Recompute every per-user XP summary from the XP ledger."""
+
+    from app.core.xp_summary import rebuild_xp_summaries
+
+    with Session(engine) as session:
+        rebuilt = rebuild_xp_summaries(session)
+        session.commit()
+
+    print(f"Rebuilt XP summaries for {rebuilt} user(s).")
+    return 0
+
+
+def progress_check(args: argparse.Namespace) -> int:
+    """Compare stored plan/day progress counters with the subtask rows."""
+
+    from app.core.progress_counters import find_progress_drift, recount_progress
+
+    with Session(engine) as session:
+        drift = find_progress_drift(session)
+        for entry in drift:
+            print(
+                f"{entry.entity_type} {entry.entity_id}: "
+                f"stored {entry.stored}, actual {entry.actual}"
+            )
+        if not drift:
+            print("Progress counters are consistent.")
+            return 0
+        if not args.repair:
+            print(f"{len(drift)} counter set(s) out of date; rerun with --repair.")
+            return 1
+
+        recount_progress(session)
+        session.commit()
+
+    print(f"Repaired {len(drift)} counter set(s).")
+    return 0
+
+
+def locks_check(args: argparse.Namespace) -> int:
+    """Compare stored day lock flags and plan status with the subtask rows."""
+
+    from app.core.locking import find_lock_drift, repair_plan_locks
+
+    with Session(engine) as session:
+        drifted = find_lock_drift(session)
+        for plan_id in drifted:
+            print(f"plan {plan_id}: lock flags or status out of date")
+        if not drifted:
+            print("Plan locks are consistent.")
+            return 0
+        if not args.repair:
+            print(f"{len(drifted)} plan(s) out of date; rerun with --repair.")
+            return 1
+
+        repair_plan_locks(session)
+        session.commit()
+
+    print(f"Repaired {len(drifted)} plan(s).")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description=__doc__.splitlines()[0]
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = subparsers.add_parser("xp-rebuild", help=xp_rebuild.__doc__)
+    rebuild.set_defaults(handler=xp_rebuild)
+
+    check = subparsers.add_parser("progress-check", help=progress_check.__doc__)
+    check.add_argument(
+        "--repair", action="store_true", help="Rebuild every counter from the subtask rows."
+    )
+    check.set_defaults(handler=progress_check)
+
+    locks = subparsers.add_parser("locks-check", help=locks_check.__doc__)
+    locks.add_argument(
+        "--repair", action="store_true", help="Rewrite drifted lock flags and plan status."
+    )
+    locks.set_defaults(handler=locks_check)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,7 +13,33 @@ class Settings(BaseSettings):
     db_url: str = os.environ.get("FP_DB_URL", "sqlite:///./family_portal.db")
     uploads_dir: str = os.environ.get("FP_UPLOADS_DIR", "/var/lib/family-portal/uploads")
     thumbs_dir: str = os.environ.get("FP_THUMBS_DIR", "/var/lib/family-portal/uploads/thumbs")
+    sqlite_profile: str = os.environ.get("FP_SQLITE_PROFILE", "wal")
+    sqlite_busy_timeout_ms: int = int(os.environ.get("FP_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_cache_size_kib: int = int(os.environ.get("FP_SQLITE_CACHE_SIZE_KIB", "8192"))
+    sqlite_mmap_size_mb: int = int(os.environ.get("FP_SQLITE_MMAP_SIZE_MB", "64"))
     max_upload_mb: int = int(os.environ.get("FP_MAX_UPLOAD_MB", "6"))
+    device_touch_flush_seconds: float = float(
+        os.environ.get("FP_DEVICE_TOUCH_FLUSH_SECONDS", "30")
+    )
+    device_cache_max_entries: int = int(os.environ.get("FP_DEVICE_CACHE_MAX_ENTRIES", "256"))
+    device_cache_ttl_seconds: float = float(
+        os.environ.get("FP_DEVICE_CACHE_TTL_SECONDS", "300")
+    )
+    device_token_mode: str = os.environ.get("FP_DEVICE_TOKEN_MODE", "id")
+    device_token_max_age_seconds: int = int(
+        os.environ.get("FP_DEVICE_TOKEN_MAX_AGE_SECONDS", "3600")
+    )
+    fragment_cache_max_entries: int = int(
+        os.environ.get("FP_FRAGMENT_CACHE_MAX_ENTRIES", "256")
+    )
+    events_max_pending: int = int(os.environ.get("FP_EVENTS_MAX_PENDING", "16"))
+    events_heartbeat_seconds: float = float(
+        os.environ.get("FP_EVENTS_HEARTBEAT_SECONDS", "15")
+    )
+
+    query_debug_headers: bool = os.environ.get(
+        "FP_QUERY_DEBUG_HEADERS", "false"
+    ).lower() in {"1", "true", "yes"}
 
 
 settings = Settings()
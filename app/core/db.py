@@ -2,17 +2,144 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.core.generation import track_data_generation
+from app.core.query_stats import instrument_engine
 
-_connect_args = {"check_same_thread": False} if settings.db_url.startswith("sqlite") else {}
-engine = create_engine(settings.db_url, connect_args=_connect_args)
+# Named PRAGMA sets applied to every new SQLite connection. ``legacy`` keeps
+# the driver defaults (rollback journal, FULL sync). ``wal`` lets board polls
+# read while an approval writes and only fsyncs at checkpoints, which may lose
+# the last transactions on power loss but never corrupts the file.
+# ``wal-durable`` keeps WAL concurrency with an fsync on every commit.
+SQLITE_PROFILES: dict[str, dict[str, str]] = {
+    "legacy": {},
+    "wal": {"journal_mode": "WAL", "synchronous": "NORMAL", "temp_store": "MEMORY"},
+    "wal-durable": {"journal_mode": "WAL", "synchronous": "FULL", "temp_store": "MEMORY"},
+}
+
+
+def sqlite_pragmas(
+    profile: str,
+    *,
+    busy_timeout_ms: int | None = None,
+    cache_size_kib: int | None = None,
+    mmap_size_mb: int | None = None,
+) -> dict[str, str]:
+    """Return the PRAGMA statements for ``profile`` with size overrides.
+
+    The timeout and size settings only apply to tuned profiles so ``legacy``
+    reproduces an untuned connection exactly.
+    """
+
+    try:
+        pragmas = dict(SQLITE_PROFILES[profile])
+    except KeyError as exc:
+        choices = ", ".join(sorted(SQLITE_PROFILES))
+        raise ValueError(
+            f"Unknown SQLite profile {profile!r} (expected one of: {choices})"
+        ) from exc
+
+    if pragmas:
+        if busy_timeout_ms is not None:
+            pragmas["busy_timeout"] = str(busy_timeout_ms)
+        if cache_size_kib is not None:
+            # Negative values are interpreted by SQLite as KiB, not pages.
+            pragmas["cache_size"] = str(-cache_size_kib)
+        if mmap_size_mb is not None:
+            pragmas["mmap_size"] = str(mmap_size_mb * 1024 * 1024)
+    return pragmas
+
+
+def apply_sqlite_pragmas(dbapi_connection: Any, pragmas: dict[str, str]) -> None:
+    """Execute ``pragmas`` on a raw DB-API SQLite connection."""
+
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _configured_pragmas(sqlite_profile: str | None) -> dict[str, str]:
+    return sqlite_pragmas(
+        sqlite_profile or settings.sqlite_profile,
+        busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+        cache_size_kib=settings.sqlite_cache_size_kib,
+        mmap_size_mb=settings.sqlite_mmap_size_mb,
+    )
+
+
+def _listen_for_connect(sync_engine: Engine, pragmas: dict[str, str]) -> None:
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply_profile(dbapi_connection, connection_record) -> None:
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+
+def build_engine(db_url: str, *, sqlite_profile: str | None = None) -> Engine:
+    """Create an engine for ``db_url``, tuning SQLite connections on connect."""
+
+    if not db_url.startswith("sqlite"):
+        return create_engine(db_url)
+
+    new_engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    _listen_for_connect(new_engine, _configured_pragmas(sqlite_profile))
+    return new_engine
+
+
+def async_db_url(db_url: str) -> str:
+    """Return the asyncio driver URL for ``db_url``.
+
+    Plain ``sqlite`` URLs are switched to the ``aiosqlite`` driver; URLs that
+    already name a driver are returned unchanged.
+    """
+
+    url = make_url(db_url)
+    if url.drivername == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+def build_async_engine(db_url: str, *, sqlite_profile: str | None = None) -> AsyncEngine:
+    """Create an asyncio engine for ``db_url`` with the same SQLite tuning."""
+
+    new_engine = create_async_engine(async_db_url(db_url))
+    if db_url.startswith("sqlite"):
+        _listen_for_connect(new_engine.sync_engine, _configured_pragmas(sqlite_profile))
+    return new_engine
+
+
+engine = build_engine(settings.db_url)
+async_engine = build_async_engine(settings.db_url)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+track_data_generation(engine, async_engine.sync_engine)
 
 
 def get_session() -> Generator[Session, None, None]:
     """Yield a database session for dependency injection."""
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an asyncio database session for dependency injection.
+
+    Read endpoints that build their template context with plain ORM code can
+    pass that builder to :meth:`AsyncSession.run_sync`; the queries then run
+    on the aiosqlite connection without holding a threadpool worker.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -2,41 +2,234 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime
+import time
 import uuid
 
 from fastapi import Request
+from sqlalchemy import event
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.config import settings
 from app.core.db import engine
+from app.core.device_cache import DeviceSnapshot, device_cache
+from app.core.device_token import (
+    DeviceClaims,
+    sign_device_claims,
+    sign_device_id,
+    unsign_device_claims,
+    unsign_device_id,
+)
+from app.core.device_touch import device_touches
 from app.models.devices import Device
 
 COOKIE_NAME = "fp_device_id"
 
+# ``session.info`` key holding snapshots of devices inserted by
+# :func:`materialize_device` that are waiting for the session to commit.
+_PENDING_SNAPSHOTS_KEY = "pending_device_snapshots"
 
-def ensure_device_cookie(request: Request) -> tuple[Device, bool]:
-    """Ensure a device identifier cookie exists and is persisted for the client.
 
-    Returns the corresponding :class:`Device` record along with a boolean flag
-    indicating whether the caller needs to set the cookie on the outgoing
-    response.
-    """
+async def ensure_device_cookie(request: Request) -> tuple[DeviceSnapshot, bool]:
+    """Resolve the device identified by the request cookie.
+
+    Returns a :class:`DeviceSnapshot` along with a boolean flag indicating
+    whether the caller needs to (re)issue the signed cookie on the outgoing
+    response (see :func:`device_cookie_value`). Browsers without a valid
+    cookie receive a freshly minted, *unpersisted* device id; the ``Device``
+    row is only written by :func:`materialize_device` once that device
+    performs a write action.
 
-    device_id = request.cookies.get(COOKIE_NAME)
-    cookie_missing = device_id is None
-    if cookie_missing:
-        device_id = str(uuid.uuid4())
+    In ``claims`` token mode a fresh token is trusted as-is, so the request
+    resolves without any lookup. Otherwise devices found in
+    :data:`device_cache` resolve without touching the database, and cache
+    misses are looked up in the threadpool so SQLite I/O never blocks the
+    event loop. The ``last_seen_at`` timestamp of persisted devices is
+    recorded in :data:`device_touches` and written back in batches.
+    """
 
     now = datetime.utcnow()
+    claims_mode = settings.device_token_mode == "claims"
+    raw_cookie = request.cookies.get(COOKIE_NAME)
+    claims = unsign_device_claims(raw_cookie) if raw_cookie else None
+
+    if claims is not None and claims_mode and _claims_are_fresh(claims):
+        snapshot = _snapshot_from_claims(claims)
+        # A newer cached version means the device was relinked since the
+        # token was issued, so the token is replaced straight away.
+        issue_cookie = snapshot.token_version != claims.version
+    else:
+        device_id = claims.device_id if claims is not None else None
+        if device_id is None and raw_cookie:
+            device_id = unsign_device_id(raw_cookie)
+
+        if device_id is None:
+            # Cookies issued before signing was introduced hold a bare UUID.
+            # They are only honoured when the device row already exists.
+            snapshot = None
+            if raw_cookie and _is_uuid(raw_cookie):
+                snapshot = await _resolve_snapshot(raw_cookie)
+            if snapshot is None or not snapshot.persisted:
+                snapshot = DeviceSnapshot(id=str(uuid.uuid4()), persisted=False)
+            issue_cookie = True
+        else:
+            snapshot = await _resolve_snapshot(device_id)
+            # Expired claims tokens were just revalidated and need a fresh
+            # token; id tokens of persisted devices upgrade in claims mode.
+            issue_cookie = claims is not None or (claims_mode and snapshot.persisted)
+
+    if snapshot.persisted:
+        device_touches.touch(snapshot.id, now)
+
+    return replace(snapshot, last_seen_at=now), issue_cookie
+
+
+def device_cookie_value(device: DeviceSnapshot, issue_cookie: bool) -> str | None:
+    """Return the cookie value to set after handling a request, if any.
+
+    In ``claims`` mode the token is also re-issued when the device was
+    materialized or relinked while the request was processed, which is
+    detected through the version stored in :data:`device_cache`.
+    """
+
+    if settings.device_token_mode == "claims":
+        latest = device_cache.peek(device.id) or device
+        if latest.persisted and (
+            issue_cookie
+            or not device.persisted
+            or latest.token_version != device.token_version
+        ):
+            return sign_device_claims(
+                DeviceClaims(
+                    device_id=latest.id,
+                    linked_user_id=latest.linked_user_id,
+                    version=latest.token_version,
+                    issued_at=int(time.time()),
+                )
+            )
+
+    if issue_cookie:
+        return sign_device_id(device.id)
+    return None
+
+
+def materialize_device(
+    session: Session, device: DeviceSnapshot | Device | None
+) -> Device | None:
+    """Return the ``Device`` row for ``device``, inserting it on first write.
+
+    Write endpoints (submissions, reviews, uploads and imports) call this
+    before recording anything that references the device. The row is added
+    and flushed in ``session`` so it commits together with the caller's
+    changes. The new snapshot only reaches :data:`device_cache` once that
+    commit succeeds; a rollback discards it, so the cache never reports a
+    device as persisted when its row was not written.
+    """
+
+    if device is None:
+        return None
+
+    row = session.get(Device, device.id)
+    if row is None:
+        now = datetime.utcnow()
+        row = Device(id=device.id, created_at=now, last_seen_at=now)
+        # TODO: emit audit log entry when audit pipeline is available.
+        session.add(row)
+        session.flush()
+        _cache_after_commit(session, DeviceSnapshot.from_device(row))
+
+    return row
+
+
+def revalidate_device(session: Session, device: DeviceSnapshot) -> DeviceSnapshot:
+    """Return ``device`` refreshed from its ``Device`` row.
+
+    In ``claims`` mode a fresh token is trusted without a lookup, so a device
+    relinked through another worker keeps its old ``linked_user_id`` until
+    the token expires. Routes that grant rights based on the linked user call
+    this first. A newer row is also stored in :data:`device_cache` so
+    :func:`device_cookie_value` re-issues the token with the response.
+    """
+
+    if not device.persisted:
+        return device
+
+    row = session.get(Device, device.id)
+    if row is None:
+        return replace(device, persisted=False, linked_user_id=None, token_version=0)
+
+    snapshot = DeviceSnapshot.from_device(row)
+    if snapshot.token_version != device.token_version:
+        device_cache.put(snapshot)
+    return replace(snapshot, last_seen_at=device.last_seen_at)
+
+
+def _cache_after_commit(session: Session, snapshot: DeviceSnapshot) -> None:
+    """Put ``snapshot`` into :data:`device_cache` when ``session`` commits."""
+
+    pending = session.info.get(_PENDING_SNAPSHOTS_KEY)
+    if pending is None:
+        pending = session.info[_PENDING_SNAPSHOTS_KEY] = {}
+        event.listen(session, "after_commit", _publish_pending_snapshots)
+        event.listen(session, "after_rollback", _discard_pending_snapshots)
+    pending[snapshot.id] = snapshot
+
+
+def _publish_pending_snapshots(session: Session) -> None:
+    pending = session.info.get(_PENDING_SNAPSHOTS_KEY, {})
+    for snapshot in pending.values():
+        device_cache.put(snapshot)
+    pending.clear()
+
+
+def _discard_pending_snapshots(session: Session) -> None:
+    session.info.get(_PENDING_SNAPSHOTS_KEY, {}).clear()
+
+
+def _claims_are_fresh(claims: DeviceClaims) -> bool:
+    return time.time() - claims.issued_at < settings.device_token_max_age_seconds
+
+
+def _snapshot_from_claims(claims: DeviceClaims) -> DeviceSnapshot:
+    """Build a snapshot from a trusted token, preferring newer cached data."""
+
+    cached = device_cache.peek(claims.device_id)
+    if cached is not None and cached.token_version >= claims.version:
+        return cached
+
+    return DeviceSnapshot(
+        id=claims.device_id,
+        friendly_name=cached.friendly_name if cached is not None else None,
+        linked_user_id=claims.linked_user_id,
+        token_version=claims.version,
+    )
+
+
+async def _resolve_snapshot(device_id: str) -> DeviceSnapshot:
+    """Return the cached snapshot for ``device_id``, loading it on a miss."""
+
+    snapshot = device_cache.get(device_id)
+    if snapshot is None:
+        snapshot = await run_in_threadpool(_load_device_snapshot, device_id)
+        device_cache.put(snapshot)
+    return snapshot
+
+
+def _load_device_snapshot(device_id: str) -> DeviceSnapshot:
+    """Read the ``Device`` row for ``device_id`` without creating it."""
+
     with Session(engine) as session:
         device = session.get(Device, device_id)
         if device is None:
-            device = Device(id=device_id, created_at=now)
-            # TODO: emit audit log entry when audit pipeline is available.
-            session.add(device)
-        device.last_seen_at = now
-        session.add(device)
-        session.commit()
-        session.refresh(device)
-
-    return device, cookie_missing
+            return DeviceSnapshot(id=device_id, persisted=False)
+        return DeviceSnapshot.from_device(device)
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
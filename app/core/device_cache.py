@@ -0,0 +1,139 @@
+"""In-process cache of device identities resolved by the cookie middleware."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.config import settings
+from app.models.devices import Device
+
+
+@dataclass(frozen=True)
+class DeviceSnapshot:
+    """Immutable copy of the device fields needed while handling a request.
+
+    ``persisted`` is ``False`` for devices that only exist as a signed cookie
+    and have not performed a write action yet. ``token_version`` mirrors
+    ``Device.token_version`` and is ``0`` for unpersisted devices.
+    """
+
+    id: str
+    friendly_name: str | None = None
+    linked_user_id: int | None = None
+    last_seen_at: datetime | None = None
+    persisted: bool = True
+    token_version: int = 0
+
+    @classmethod
+    def from_device(cls, device: Device) -> "DeviceSnapshot":
+        """Return a snapshot of ``device``."""
+
+        return cls(
+            id=device.id,
+            friendly_name=device.friendly_name,
+            linked_user_id=device.linked_user_id,
+            last_seen_at=device.last_seen_at,
+            token_version=device.token_version,
+        )
+
+
+class DeviceIdentityCache:
+    """Bounded LRU cache of :class:`DeviceSnapshot` entries with a TTL.
+
+    Entries expire ``ttl_seconds`` after they were stored so changes made by
+    another worker process become visible without explicit invalidation. Admin
+    routes that change a device :meth:`put` a fresh snapshot for immediate
+    effect in the current process.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, DeviceSnapshot]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, device_id: str) -> DeviceSnapshot | None:
+        """Return the cached snapshot for ``device_id`` or ``None`` on a miss."""
+
+        with self._lock:
+            entry = self._entries.get(device_id)
+            if entry is not None:
+                expires_at, snapshot = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(device_id)
+                    self.hits += 1
+                    return snapshot
+                del self._entries[device_id]
+            self.misses += 1
+            return None
+
+    def peek(self, device_id: str) -> DeviceSnapshot | None:
+        """Return a live entry without touching the LRU order or the counters."""
+
+        with self._lock:
+            entry = self._entries.get(device_id)
+            if entry is None or entry[0] <= self._clock():
+                return None
+            return entry[1]
+
+    def put(self, snapshot: DeviceSnapshot) -> None:
+        """Store ``snapshot``, evicting the least recently used entry if full."""
+
+        with self._lock:
+            self._entries[snapshot.id] = (self._clock() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(snapshot.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, device_id: str) -> None:
+        """Drop any cached snapshot for ``device_id``."""
+
+        with self._lock:
+            self._entries.pop(device_id, None)
+
+    def clear(self) -> None:
+        """Remove every cached entry and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Return hit/miss counters and the current cache size."""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": 0.0 if lookups == 0 else round(self.hits / lookups, 4),
+            }
+
+
+device_cache = DeviceIdentityCache(
+    max_entries=settings.device_cache_max_entries,
+    ttl_seconds=settings.device_cache_ttl_seconds,
+)
+
+
+__all__ = ["DeviceIdentityCache", "DeviceSnapshot", "device_cache"]
@@ -0,0 +1,110 @@
+"""Signing helpers for the device identifier cookie.
+
+Two cookie formats exist. The default ``id`` mode stores only the device id
+and its signature (``<device-id>.<sig>``). The optional ``claims`` mode stores
+a compact token that also embeds the linked user, the device's token version
+and the issue time (``c1.<device-id>.<user-id>.<version>.<issued>.<sig>``),
+so the server can trust it without a database lookup until it expires.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+_SEPARATOR = "."
+_CLAIMS_PREFIX = "c1"
+
+
+@dataclass(frozen=True)
+class DeviceClaims:
+    """Identity facts carried by a ``claims`` mode device token."""
+
+    device_id: str
+    linked_user_id: int | None
+    version: int
+    issued_at: int
+
+
+def _signature(payload: str) -> str:
+    digest = hmac.new(
+        settings.session_secret.encode("utf-8"), payload.encode("utf-8"), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def _split_signed(value: str) -> str | None:
+    """Return the payload of ``value`` when its trailing signature is valid."""
+
+    payload, separator, signature = value.rpartition(_SEPARATOR)
+    if not separator or not payload:
+        return None
+    if not hmac.compare_digest(signature, _signature(payload)):
+        return None
+    return payload
+
+
+def sign_device_id(device_id: str) -> str:
+    """Return the cookie value carrying ``device_id`` and its HMAC signature."""
+
+    return f"{device_id}{_SEPARATOR}{_signature(device_id)}"
+
+
+def unsign_device_id(value: str) -> str | None:
+    """Return the device id from a signed ``id`` cookie, or ``None`` if invalid."""
+
+    payload = _split_signed(value)
+    if payload is None or _SEPARATOR in payload:
+        return None
+    return payload
+
+
+def sign_device_claims(claims: DeviceClaims) -> str:
+    """Return a signed ``claims`` mode token for ``claims``."""
+
+    payload = _SEPARATOR.join(
+        (
+            _CLAIMS_PREFIX,
+            claims.device_id,
+            "" if claims.linked_user_id is None else str(claims.linked_user_id),
+            str(claims.version),
+            str(claims.issued_at),
+        )
+    )
+    return f"{payload}{_SEPARATOR}{_signature(payload)}"
+
+
+def unsign_device_claims(value: str) -> DeviceClaims | None:
+    """Return the claims from a signed token, or ``None`` if invalid."""
+
+    payload = _split_signed(value)
+    if payload is None:
+        return None
+
+    parts = payload.split(_SEPARATOR)
+    if len(parts) != 5 or parts[0] != _CLAIMS_PREFIX or not parts[1]:
+        return None
+
+    _, device_id, linked_user_id, version, issued_at = parts
+    try:
+        return DeviceClaims(
+            device_id=device_id,
+            linked_user_id=int(linked_user_id) if linked_user_id else None,
+            version=int(version),
+            issued_at=int(issued_at),
+        )
+    except ValueError:
+        return None
+
+
+__all__ = [
+    "DeviceClaims",
+    "sign_device_claims",
+    "sign_device_id",
+    "unsign_device_claims",
+    "unsign_device_id",
+]
@@ -0,0 +1,98 @@
+"""Write-behind buffering for device ``last_seen_at`` timestamps."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import bindparam, or_
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.db import engine
+from app.models.devices import Device
+
+logger = logging.getLogger(__name__)
+
+_device_table = Device.__table__
+
+_TOUCH_STATEMENT = (
+    _device_table.update()
+    .where(_device_table.c.id == bindparam("touched_id"))
+    .where(
+        or_(
+            _device_table.c.last_seen_at.is_(None),
+            _device_table.c.last_seen_at < bindparam("touched_at"),
+        )
+    )
+    .values(last_seen_at=bindparam("touched_at"))
+)
+
+
+class DeviceTouchBuffer:
+    """Collect device sightings in memory and persist them in batches.
+
+    Every request records the device it came from via :meth:`touch`. Only the
+    most recent timestamp per device is retained, and :meth:`flush` writes all
+    pending timestamps with a single executemany ``UPDATE`` inside one
+    transaction instead of committing once per request.
+    """
+
+    def __init__(self, flush_interval: float) -> None:
+        self.flush_interval = flush_interval
+        self._pending: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def touch(self, device_id: str, seen_at: datetime | None = None) -> None:
+        """Record that ``device_id`` was seen at ``seen_at`` (defaults to now)."""
+
+        seen_at = seen_at or datetime.utcnow()
+        with self._lock:
+            previous = self._pending.get(device_id)
+            if previous is None or previous < seen_at:
+                self._pending[device_id] = seen_at
+
+    def drain(self) -> dict[str, datetime]:
+        """Return and clear every pending sighting."""
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def flush(self, bind: Engine | None = None) -> int:
+        """Persist pending sightings and return the number of devices written.
+
+        Sightings are re-queued when the write fails so a transient ``database
+        is locked`` error only delays the update until the next flush.
+        """
+
+        pending = self.drain()
+        if not pending:
+            return 0
+
+        rows = [
+            {"touched_id": device_id, "touched_at": seen_at}
+            for device_id, seen_at in pending.items()
+        ]
+        try:
+            with (bind or engine).begin() as connection:
+                connection.execute(_TOUCH_STATEMENT, rows)
+        except SQLAlchemyError:
+            logger.warning("Failed to flush %d device sightings", len(rows), exc_info=True)
+            for device_id, seen_at in pending.items():
+                self.touch(device_id, seen_at)
+            return 0
+
+        return len(rows)
+
+
+device_touches = DeviceTouchBuffer(flush_interval=settings.device_touch_flush_seconds)
+
+
+__all__ = ["DeviceTouchBuffer", "device_touches"]
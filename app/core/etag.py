@@ -0,0 +1,75 @@
+"""Strong ETags and ``If-None-Match`` handling for polled HTMX partials.
+
+ETags are derived from the data generation (see :mod:`app.core.generation`)
+plus whatever else shapes the rendered fragment, so a match can be detected
+before any context is built or template rendered. A fingerprint of the
+template directory is always mixed in so a deploy that only changes markup
+still invalidates cached fragments.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from fastapi import Request, Response
+
+TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "templates"
+
+# Browsers must revalidate every poll; ``Vary`` keeps HTMX fragments and full
+# pages (and per-device fragments) apart in the browser cache.
+CACHE_CONTROL = "no-cache"
+
+
+def _fingerprint_templates(directory: Path) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(directory.rglob("*.html")):
+        digest.update(str(path.relative_to(directory)).encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+TEMPLATES_FINGERPRINT = _fingerprint_templates(TEMPLATE_DIR)
+
+
+def make_etag(*parts: object) -> str:
+    """Return a quoted strong ETag for ``parts`` and the template fingerprint."""
+
+    payload = "|".join(str(part) for part in (TEMPLATES_FINGERPRINT, *parts))
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return ``True`` when the request's ``If-None-Match`` covers ``etag``.
+
+    Uses the weak comparison RFC 9110 prescribes for ``If-None-Match``.
+    """
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str, *, vary: str) -> Response:
+    """Return an empty ``304 Not Modified`` response for ``etag``."""
+
+    return Response(status_code=304, headers=conditional_headers(etag, vary=vary))
+
+
+def conditional_headers(etag: str, *, vary: str) -> dict[str, str]:
+    """Return the caching headers sent with both 200 and 304 responses."""
+
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": vary}
+
+
+__all__ = [
+    "TEMPLATES_FINGERPRINT",
+    "conditional_headers",
+    "etag_matches",
+    "make_etag",
+    "not_modified",
+]
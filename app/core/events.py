@@ -0,0 +1,224 @@
+"""In-process broadcaster pushing domain events to Server-Sent Events clients.
+
+Write routes publish ``planProgressUpdated`` and ``reviewQueueRefresh``, the
+device admin routes publish ``devicesUpdated``, and every open page receives
+them over ``GET /events``. Delivery is per worker process; pages also poll
+slowly so writes handled by another worker still show up.
+
+Events are refresh hints rather than data, so each client only keeps a
+small set of *distinct* pending events: repeats coalesce, and a client that
+falls too far behind has its backlog replaced by a single ``resync`` event
+telling it to refresh everything. Publishing never blocks and memory per
+client stays bounded no matter how slowly it reads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
+
+from app.core.config import settings
+
+RESYNC_EVENT = "resync"
+
+# Request header carrying the page's client id. Events published for a
+# request that sent it are tagged with an ``origin`` so the page that made
+# the change, which already swapped in the result, can ignore them.
+CLIENT_ID_HEADER = "X-Client-Id"
+
+_MAX_ORIGIN_LENGTH = 64
+
+
+def format_sse(name: str, data: str) -> str:
+    """Return one event in the ``text/event-stream`` wire format."""
+
+    return f"event: {name}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """Pending events for one connected client."""
+
+    def __init__(self, broadcaster: EventBroadcaster, max_pending: int) -> None:
+        self._broadcaster = broadcaster
+        self._max_pending = max_pending
+        self._pending: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self._resync = False
+        self.closed = False
+
+    def _offer(self, name: str, data: str) -> None:
+        if self.closed:
+            return
+        key = (name, data)
+        if key in self._pending:
+            self._broadcaster.coalesced += 1
+        elif self._resync:
+            # A resync is already queued and covers this event.
+            self._broadcaster.coalesced += 1
+        elif len(self._pending) >= self._max_pending:
+            self._broadcaster.overflows += 1
+            self._pending.clear()
+            self._resync = True
+        else:
+            self._pending[key] = None
+        self._wakeup.set()
+
+    def _close(self) -> None:
+        self.closed = True
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: float) -> list[tuple[str, str]] | None:
+        """Wait up to ``timeout`` seconds and return every pending event.
+
+        Returns an empty list when the wait timed out and ``None`` once the
+        subscription was closed.
+        """
+
+        if not self._pending and not self._resync and not self.closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._wakeup.clear()
+        if self.closed:
+            return None
+
+        if self._resync:
+            self._resync = False
+            self._pending.clear()
+            return [(RESYNC_EVENT, "{}")]
+        batch = list(self._pending)
+        self._pending.clear()
+        return batch
+
+
+class EventBroadcaster:
+    """Fan published events out to every live :class:`Subscription`.
+
+    Subscriptions live on the event loop. :meth:`publish` may be called from
+    any thread — synchronous routes run in the threadpool — and hands the
+    event to the loop without waiting.
+    """
+
+    def __init__(self, max_pending: int) -> None:
+        self.max_pending = max_pending
+        self._subscriptions: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self._accepting = True
+        self.published = 0
+        self.coalesced = 0
+        self.overflows = 0
+
+    def subscribe(self) -> Subscription:
+        """Register a new client. Must be called on the event loop.
+
+        After :meth:`close` the returned subscription is already closed, so a
+        stream opened while the server shuts down ends straight away.
+        """
+
+        subscription = Subscription(self, self.max_pending)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            if self._accepting:
+                self._subscriptions.add(subscription)
+            else:
+                subscription._close()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+        subscription._close()
+
+    def publish(self, name: str, payload: Any = None, *, origin: str | None = None) -> None:
+        """Queue ``name`` with ``payload`` for every connected client.
+
+        ``origin`` is the publishing page's client id, if it sent one.
+        """
+
+        with self._lock:
+            loop = self._loop
+            if not self._subscriptions or loop is None or loop.is_closed():
+                return
+            self.published += 1
+        fields = dict(payload) if isinstance(payload, Mapping) else {}
+        if origin:
+            fields["origin"] = origin[:_MAX_ORIGIN_LENGTH]
+        data = json.dumps(fields, sort_keys=True)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(name, data)
+        else:
+            loop.call_soon_threadsafe(self._deliver, name, data)
+
+    def publish_many(self, events: Mapping[str, Any], *, origin: str | None = None) -> None:
+        """Publish every entry of an ``HX-Trigger`` style mapping."""
+
+        for name, payload in events.items():
+            self.publish(name, payload, origin=origin)
+
+    def open(self) -> None:
+        """Accept subscriptions again, e.g. on application startup."""
+
+        with self._lock:
+            self._accepting = True
+
+    def close(self) -> None:
+        """End every subscription and refuse new ones until :meth:`open`."""
+
+        with self._lock:
+            self._accepting = False
+            subscriptions, self._subscriptions = self._subscriptions, set()
+        for subscription in subscriptions:
+            subscription._close()
+
+    def close_soon(self) -> None:
+        """Schedule :meth:`close` on the event loop.
+
+        Safe to call from a signal handler: it takes no lock, since the
+        interrupted code may be holding it.
+        """
+
+        self._accepting = False
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.close)
+
+    def _deliver(self, name: str, data: str) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription._offer(name, data)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            clients = len(self._subscriptions)
+        return {
+            "clients": clients,
+            "max_pending": self.max_pending,
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "overflows": self.overflows,
+        }
+
+
+event_broadcaster = EventBroadcaster(max_pending=settings.events_max_pending)
+
+
+__all__ = [
+    "CLIENT_ID_HEADER",
+    "EventBroadcaster",
+    "RESYNC_EVENT",
+    "Subscription",
+    "event_broadcaster",
+    "format_sse",
+]
@@ -0,0 +1,122 @@
+"""LRU cache of rendered per-entity HTML fragments.
+
+Board member cards, plan days and review queue items are rendered through
+the ``render_fragment`` template global. Each rendered fragment is stored
+under its template and entity id together with a *version*: a small tuple
+of the row timestamps and counters the fragment renders, built next to the
+entity's context. A page where one member or day changed re-renders that
+fragment only and reuses the rest, and checking a hit is a tuple comparison
+rather than a walk over the whole context.
+
+The contexts themselves come from batched queries; skipping that loading is
+left to the layers above (the board's generation-keyed context cache and the
+``304`` answers of the polled partials).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import pass_context
+from jinja2.runtime import Context
+from markupsafe import Markup
+
+from app.core.config import settings
+
+
+class FragmentCache:
+    """Bounded LRU of rendered HTML keyed by entity, validated by version."""
+
+    def __init__(self, *, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[Any, Markup]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_render(
+        self, key: Hashable, version: Any, render: Callable[[], str]
+    ) -> Markup:
+        """Return the HTML cached for ``key`` if it was rendered from ``version``.
+
+        Versions are compared with ``==``. Pass a cheap token, such as the
+        ``updated_at`` and counters of the rendered rows, that changes
+        whenever the rendered output would.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        html = Markup(render())
+        with self._lock:
+            self._entries[key] = (version, html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return html
+
+    def clear(self) -> None:
+        """Drop every cached fragment and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters and the current cache size."""
+
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+fragment_cache = FragmentCache(max_entries=settings.fragment_cache_max_entries)
+
+
+@pass_context
+def render_fragment(
+    context: Context, template_name: str, key: Hashable, version: Any, **variables: Any
+) -> Markup:
+    """Template global: render ``template_name`` with ``variables`` via the cache.
+
+    ``key`` is the entity id. The fragment only sees ``variables``, so
+    everything it renders must be passed explicitly and covered by
+    ``version``.
+    """
+
+    environment = context.environment
+    return fragment_cache.get_or_render(
+        (template_name, key),
+        version,
+        lambda: environment.get_template(template_name).render(variables),
+    )
+
+
+def register_fragment_cache(templates: Jinja2Templates) -> None:
+    """Expose :func:`render_fragment` to ``templates``."""
+
+    templates.env.globals["render_fragment"] = render_fragment
+
+
+__all__ = [
+    "FragmentCache",
+    "fragment_cache",
+    "register_fragment_cache",
+    "render_fragment",
+]
@@ -0,0 +1,154 @@
+"""Global data-generation counter and caches keyed by it.
+
+Every ORM flush that inserts, updates or deletes rows through one of the
+app's engines increments the single ``data_generation`` row inside the same
+transaction, so the counter changes exactly when committed data does, no
+matter which worker process wrote it. Sessions bound to other engines (ad-hoc
+scripts, test databases) are left alone and need no ``data_generation``
+table.
+Read paths compare the counter with the generation their cached value was
+built for and only rebuild when it moved.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models.generation import DATA_GENERATION_ROW_ID, DataGeneration
+
+T = TypeVar("T")
+
+_generation_table = DataGeneration.__table__
+
+_tracked_engines: weakref.WeakSet[Engine] = weakref.WeakSet()
+
+
+def bump_generation(connection: Connection) -> None:
+    """Increment the counter on ``connection``, creating the row if missing."""
+
+    result = connection.execute(
+        update(_generation_table)
+        .where(_generation_table.c.id == DATA_GENERATION_ROW_ID)
+        .values(value=_generation_table.c.value + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            insert(_generation_table).values(id=DATA_GENERATION_ROW_ID, value=1)
+        )
+
+
+def current_generation(session: Session) -> int:
+    """Return the committed data generation visible to ``session``."""
+
+    value = session.execute(
+        select(_generation_table.c.value).where(
+            _generation_table.c.id == DATA_GENERATION_ROW_ID
+        )
+    ).scalar_one_or_none()
+    return value or 0
+
+
+def _bump_after_flush(session: Session, flush_context) -> None:
+    bind = session.get_bind()
+    if getattr(bind, "engine", bind) not in _tracked_engines:
+        return
+    # ``new``/``dirty``/``deleted`` still describe the flushed changes here.
+    if session.new or session.deleted or any(
+        session.is_modified(instance) for instance in session.dirty
+    ):
+        bump_generation(session.connection())
+
+
+def track_data_generation(*engines: Engine) -> None:
+    """Bump the counter after ORM flushes on ``engines`` that changed rows.
+
+    Safe to call repeatedly; each call adds to the set of tracked engines.
+    Pass the synchronous engine behind an ``AsyncEngine`` (``sync_engine``).
+    """
+
+    _tracked_engines.update(engines)
+    if not event.contains(Session, "after_flush", _bump_after_flush):
+        event.listen(Session, "after_flush", _bump_after_flush)
+
+
+class GenerationCache:
+    """Per-process LRU of values tagged with the generation they reflect."""
+
+    def __init__(self, *, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(
+        self,
+        session: Session,
+        key: str,
+        builder: Callable[[Session], T],
+        *,
+        generation: int | None = None,
+    ) -> T:
+        """Return the value for ``key``, rebuilding it if the data changed.
+
+        The generation is read *before* building, so a write that commits
+        while the value is built leaves it tagged with the older generation
+        and the next call rebuilds it. Callers that already read the
+        generation (e.g. to compute an ETag) can pass it in.
+        """
+
+        if generation is None:
+            generation = current_generation(session)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = builder(session)
+        with self._lock:
+            self._entries[key] = (generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached value and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the current cache size."""
+
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+context_cache = GenerationCache()
+
+
+__all__ = [
+    "GenerationCache",
+    "bump_generation",
+    "context_cache",
+    "current_generation",
+    "track_data_generation",
+]
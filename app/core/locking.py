@@ -4,9 +4,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable
+from typing import Iterable, Iterator
 from weakref import WeakKeyDictionary
 
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
 from app.models.plans import Plan, PlanStatus
 from app.models.tasks import PlanDay, SubtaskStatus
 
@@ -166,43 +169,94 @@ def _is_day_complete(day: PlanDay, *, cache: ProgressCache | None = None) -> boo
     return cache.day_progress(day).is_complete
 
 
-def refresh_plan_day_locks(plan: Plan) -> bool:
-    """Synchronise day lock flags and plan completion state."""
+def _expected_plan_state(plan: Plan) -> tuple[list[tuple[PlanDay, bool]], PlanStatus]:
+    """Return each day with the lock flag it should have, and the plan status."""
 
     progress_cache = ProgressCache()
     ordered_days = list(_iter_ordered_days(plan))
 
-    if not ordered_days:
-        if plan.status == PlanStatus.COMPLETE:
-            plan.status = PlanStatus.IN_PROGRESS
-            plan.updated_at = datetime.utcnow()
-            return True
-        return False
-
-    any_changes = False
+    expected_locks: list[tuple[PlanDay, bool]] = []
     previous_complete = True
     all_days_complete = True
 
     for day in ordered_days:
         day_complete = _is_day_complete(day, cache=progress_cache)
         all_days_complete = all_days_complete and day_complete
+        expected_locks.append((day, is_day_locked(previous_complete)))
+        previous_complete = day_complete
+
+    expected_status = plan.status
+    if ordered_days and all_days_complete:
+        expected_status = PlanStatus.COMPLETE
+    elif plan.status == PlanStatus.COMPLETE:
+        expected_status = PlanStatus.IN_PROGRESS
+    return expected_locks, expected_status
+
+
+def refresh_plan_day_locks(plan: Plan) -> bool:
+    """Synchronise day lock flags and plan completion state."""
+
+    expected_locks, expected_status = _expected_plan_state(plan)
+    any_changes = False
 
-        should_be_locked = is_day_locked(previous_complete)
+    for day, should_be_locked in expected_locks:
         if day.locked != should_be_locked:
             day.locked = should_be_locked
             day.updated_at = datetime.utcnow()
             any_changes = True
 
-        previous_complete = day_complete
-
-    if all_days_complete:
-        if plan.status != PlanStatus.COMPLETE:
-            plan.status = PlanStatus.COMPLETE
-            plan.updated_at = datetime.utcnow()
-            any_changes = True
-    elif plan.status == PlanStatus.COMPLETE:
-        plan.status = PlanStatus.IN_PROGRESS
+    if plan.status != expected_status:
+        plan.status = expected_status
         plan.updated_at = datetime.utcnow()
         any_changes = True
 
     return any_changes
+
+
+# Draft and archived plans keep the status they were given by hand.
+LOCK_MANAGED_STATUSES = (PlanStatus.IN_PROGRESS, PlanStatus.COMPLETE)
+
+
+def _iter_lock_managed_plans(session: Session, batch_size: int) -> Iterator[list[Plan]]:
+    plan_ids = session.exec(
+        select(Plan.id).where(Plan.status.in_(LOCK_MANAGED_STATUSES)).order_by(Plan.id)
+    ).all()
+    for start in range(0, len(plan_ids), batch_size):
+        yield session.exec(
+            select(Plan)
+            .where(Plan.id.in_(plan_ids[start : start + batch_size]))
+            .options(selectinload(Plan.days).selectinload(PlanDay.subtasks))
+        ).all()
+
+
+def find_lock_drift(session: Session, *, batch_size: int = 50) -> list[int]:
+    """Return the ids of in-progress/complete plans whose locks or status drifted.
+
+    Read-only: nothing is modified or flushed.
+    """
+
+    drifted: list[int] = []
+    for plans in _iter_lock_managed_plans(session, batch_size):
+        for plan in plans:
+            expected_locks, expected_status = _expected_plan_state(plan)
+            if plan.status != expected_status or any(
+                day.locked != locked for day, locked in expected_locks
+            ):
+                drifted.append(plan.id)
+    return sorted(drifted)
+
+
+def repair_plan_locks(session: Session, *, batch_size: int = 50) -> list[int]:
+    """Re-derive lock flags and status of in-progress/complete plans.
+
+    Returns the ids of plans that had drifted. Plans are loaded in batches
+    of ``batch_size`` with their days and subtasks. The caller commits.
+    """
+
+    repaired: list[int] = []
+    for plans in _iter_lock_managed_plans(session, batch_size):
+        for plan in plans:
+            if refresh_plan_day_locks(plan):
+                repaired.append(plan.id)
+        session.flush()
+    return sorted(repaired)
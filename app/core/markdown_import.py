@@ -9,6 +9,7 @@ from typing import Iterable
 
 from sqlmodel import Session
 
+from app.core.locking import is_day_locked
 from app.models.plans import Plan, PlanStatus
 from app.models.tasks import PlanDay, Subtask
 
@@ -177,14 +178,22 @@ def _create_plan_hierarchy(
     session.add(plan)
 
     total_xp = 0
+    # Nothing is approved yet, so only days without subtasks are complete.
+    previous_complete = True
 
     for day_index, day in enumerate(plan_data.days):
         plan_day = PlanDay(
             day_index=day_index,
             title=day.title,
-            locked=day_index != 0,
+            locked=is_day_locked(previous_complete),
+            total_count=len(day.subtasks),
         )
+        previous_complete = previous_complete and not day.subtasks
         plan.days.append(plan_day)
+        plan.total_count += len(day.subtasks)
+        plan.day_count += 1
+        if not day.subtasks:
+            plan.completed_day_count += 1
 
         for order_index, subtask in enumerate(day.subtasks):
             plan_day.subtasks.append(
@@ -197,6 +206,8 @@ def _create_plan_hierarchy(
             total_xp += subtask.xp
 
     plan.total_xp = total_xp
+    if plan.days and previous_complete:
+        plan.status = PlanStatus.COMPLETE
     return plan
 
 
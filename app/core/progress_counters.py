@@ -0,0 +1,178 @@
+"""Maintenance of the denormalized progress counters on plans and days.
+
+``plan_day.approved_count``/``total_count`` and the rolled-up ``plan``
+counters let progress render from the plan and day rows alone. Routes that
+change a subtask's status call :func:`record_status_change` in the same
+transaction; :func:`find_progress_drift` and :func:`recount_progress` check
+and rebuild the counters from the subtask rows.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from dataclasses import dataclass
+
+from sqlalchemy import bindparam, func, select, update
+from sqlmodel import Session
+
+from app.core.generation import bump_generation
+from app.core.locking import DayProgress, PlanProgress
+from app.core.progress_queries import day_progress_by_day, plan_progress_by_plan
+from app.models.plans import Plan
+from app.models.tasks import PlanDay, Subtask, SubtaskStatus
+
+_plan_day_table = PlanDay.__table__
+
+
+@dataclass(frozen=True)
+class ProgressDrift:
+    """A stored counter set that disagrees with the subtask rows."""
+
+    entity_type: str
+    entity_id: int
+    stored: tuple[int, ...]
+    actual: tuple[int, ...]
+
+
+def day_progress_from_counters(day: PlanDay) -> DayProgress:
+    """Return ``day``'s progress from its stored counters."""
+
+    return DayProgress(approved_subtasks=day.approved_count, total_subtasks=day.total_count)
+
+
+def plan_progress_from_counters(plan: Plan) -> PlanProgress:
+    """Return ``plan``'s progress from its stored counters."""
+
+    return PlanProgress(
+        approved_subtasks=plan.approved_count,
+        total_subtasks=plan.total_count,
+        completed_days=plan.completed_day_count,
+        total_days=plan.day_count,
+    )
+
+
+def _roll_up_plans(session: Session, plan_ids: Collection[int] | None = None) -> None:
+    """Recompute plan counters from their days' counters."""
+
+    days = select(PlanDay).where(PlanDay.plan_id == Plan.id)
+    stmt = update(Plan).values(
+        approved_count=days.with_only_columns(
+            func.coalesce(func.sum(PlanDay.approved_count), 0)
+        ).scalar_subquery(),
+        total_count=days.with_only_columns(
+            func.coalesce(func.sum(PlanDay.total_count), 0)
+        ).scalar_subquery(),
+        completed_day_count=days.with_only_columns(func.count(PlanDay.id))
+        .where(PlanDay.approved_count == PlanDay.total_count)
+        .scalar_subquery(),
+        day_count=days.with_only_columns(func.count(PlanDay.id)).scalar_subquery(),
+    )
+    if plan_ids is not None:
+        stmt = stmt.where(Plan.id.in_(plan_ids))
+    session.execute(stmt, execution_options={"synchronize_session": "fetch"})
+
+
+def record_status_change(
+    session: Session, subtask: Subtask, previous_status: SubtaskStatus
+) -> None:
+    """Adjust counters for ``subtask`` having moved from ``previous_status``.
+
+    Call this in the transaction that changes the status. The day counter is
+    incremented in SQL rather than from the loaded value so concurrent
+    approvals in the same day cannot overwrite each other's counts.
+    """
+
+    delta = int(subtask.status == SubtaskStatus.APPROVED) - int(
+        previous_status == SubtaskStatus.APPROVED
+    )
+    if delta == 0:
+        return
+
+    session.execute(
+        update(PlanDay)
+        .where(PlanDay.id == subtask.plan_day_id)
+        .values(approved_count=PlanDay.approved_count + delta),
+        execution_options={"synchronize_session": "fetch"},
+    )
+    plan_id = session.execute(
+        select(PlanDay.plan_id).where(PlanDay.id == subtask.plan_day_id)
+    ).scalar_one()
+    _roll_up_plans(session, [plan_id])
+
+
+def recount_progress(session: Session, *, plan_ids: Collection[int] | None = None) -> int:
+    """Rebuild counters from the subtask rows and return the days rewritten.
+
+    Limited to ``plan_ids`` when given. Bumps the data generation since the
+    writes bypass the ORM flush. The caller commits.
+    """
+
+    day_progress = day_progress_by_day(session, plan_ids=plan_ids)
+    if day_progress:
+        session.execute(
+            _plan_day_table.update()
+            .where(_plan_day_table.c.id == bindparam("day_id"))
+            .values(
+                approved_count=bindparam("approved"),
+                total_count=bindparam("total"),
+            ),
+            [
+                {
+                    "day_id": day_id,
+                    "approved": progress.approved_subtasks,
+                    "total": progress.total_subtasks,
+                }
+                for day_id, progress in day_progress.items()
+            ],
+        )
+    _roll_up_plans(session, plan_ids)
+    bump_generation(session.connection())
+    session.expire_all()
+    return len(day_progress)
+
+
+def find_progress_drift(session: Session) -> list[ProgressDrift]:
+    """Return every day and plan whose stored counters are out of date."""
+
+    drift: list[ProgressDrift] = []
+
+    actual_days = day_progress_by_day(session)
+    for day_id, approved, total in session.execute(
+        select(PlanDay.id, PlanDay.approved_count, PlanDay.total_count).order_by(PlanDay.id)
+    ):
+        actual = actual_days[day_id]
+        expected = (actual.approved_subtasks, actual.total_subtasks)
+        if (approved, total) != expected:
+            drift.append(ProgressDrift("plan_day", day_id, (approved, total), expected))
+
+    actual_plans = plan_progress_by_plan(session)
+    for plan_id, *stored in session.execute(
+        select(
+            Plan.id,
+            Plan.approved_count,
+            Plan.total_count,
+            Plan.completed_day_count,
+            Plan.day_count,
+        ).order_by(Plan.id)
+    ):
+        actual = actual_plans[plan_id]
+        expected = (
+            actual.approved_subtasks,
+            actual.total_subtasks,
+            actual.completed_days,
+            actual.total_days,
+        )
+        if tuple(stored) != expected:
+            drift.append(ProgressDrift("plan", plan_id, tuple(stored), expected))
+
+    return drift
+
+
+__all__ = [
+    "ProgressDrift",
+    "day_progress_from_counters",
+    "find_progress_drift",
+    "plan_progress_from_counters",
+    "recount_progress",
+    "record_status_change",
+]
@@ -0,0 +1,110 @@
+"""SQL aggregate queries for plan and day progress.
+
+These return the same :class:`DayProgress` and :class:`PlanProgress` values
+as :class:`app.core.locking.ProgressCache` but compute them with ``GROUP BY``
+in the database, so callers that only need counts never load subtask rows.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+
+from sqlalchemy import case, func, or_
+from sqlmodel import Session, select
+
+from app.core.locking import DayProgress, PlanProgress
+from app.models.plans import Plan, PlanStatus
+from app.models.tasks import PlanDay, Subtask, SubtaskStatus
+
+
+def _day_totals_statement(plan_ids: Collection[int] | None):
+    stmt = (
+        select(
+            PlanDay.id.label("day_id"),
+            PlanDay.plan_id.label("plan_id"),
+            func.count(Subtask.id).label("total_subtasks"),
+            func.coalesce(
+                func.sum(case((Subtask.status == SubtaskStatus.APPROVED, 1), else_=0)), 0
+            ).label("approved_subtasks"),
+        )
+        .outerjoin(Subtask, Subtask.plan_day_id == PlanDay.id)
+        .group_by(PlanDay.id, PlanDay.plan_id)
+    )
+    if plan_ids is not None:
+        stmt = stmt.where(PlanDay.plan_id.in_(plan_ids))
+    return stmt
+
+
+def day_progress_by_day(
+    session: Session, *, plan_ids: Collection[int] | None = None
+) -> dict[int, DayProgress]:
+    """Return progress for every day, optionally limited to ``plan_ids``."""
+
+    rows = session.exec(_day_totals_statement(plan_ids)).all()
+    return {
+        row.day_id: DayProgress(
+            approved_subtasks=row.approved_subtasks, total_subtasks=row.total_subtasks
+        )
+        for row in rows
+    }
+
+
+def plan_progress_by_plan(
+    session: Session,
+    *,
+    plan_ids: Collection[int] | None = None,
+    status: PlanStatus | None = None,
+) -> dict[int, PlanProgress]:
+    """Return progress for every plan, optionally limited by id or ``status``.
+
+    Plans without days are included with all counts at zero. A day counts as
+    completed when it has no subtasks or all of them are approved, matching
+    :attr:`DayProgress.is_complete`.
+    """
+
+    days = _day_totals_statement(plan_ids).subquery()
+    stmt = (
+        select(
+            Plan.id,
+            func.coalesce(func.sum(days.c.approved_subtasks), 0),
+            func.coalesce(func.sum(days.c.total_subtasks), 0),
+            func.coalesce(
+                func.sum(
+                    case(
+                        (
+                            or_(
+                                days.c.total_subtasks == 0,
+                                days.c.approved_subtasks == days.c.total_subtasks,
+                            ),
+                            1,
+                        ),
+                        else_=0,
+                    )
+                ),
+                0,
+            ),
+            func.count(days.c.day_id),
+        )
+        .outerjoin(days, days.c.plan_id == Plan.id)
+        .group_by(Plan.id)
+    )
+    if plan_ids is not None:
+        stmt = stmt.where(Plan.id.in_(plan_ids))
+    if status is not None:
+        stmt = stmt.where(Plan.status == status)
+
+    return {
+        plan_id: PlanProgress(
+            approved_subtasks=approved,
+            total_subtasks=total,
+            completed_days=completed_days,
+            total_days=total_days,
+        )
+        for plan_id, approved, total, completed_days, total_days in session.exec(stmt)
+    }
+
+
+__all__ = [
+    "day_progress_by_day",
+    "plan_progress_by_plan",
+]
@@ -0,0 +1,151 @@
+"""Per-request SQL statement counters built on SQLAlchemy cursor events."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_STATEMENT_PREVIEW_CHARS = 200
+_START_TIMES_KEY = "query_stats_start_times"
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while handling a single request."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Add one executed statement taking ``elapsed`` seconds."""
+
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed >= self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = " ".join(statement.split())[:_STATEMENT_PREVIEW_CHARS]
+
+    def as_headers(self) -> dict[str, str]:
+        """Return debug response headers describing these statistics."""
+
+        return {
+            "X-DB-Query-Count": str(self.count),
+            "X-DB-Time-Ms": f"{self.total_seconds * 1000:.2f}",
+            "X-DB-Slowest-Ms": f"{self.slowest_seconds * 1000:.2f}",
+        }
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """Count statements executed in the current context until exit.
+
+    The context variable is copied into threadpool workers and SQLAlchemy's
+    asyncio greenlets, so statements issued from sync routes and from
+    ``AsyncSession.run_sync`` are attributed to the same request.
+    """
+
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info[_START_TIMES_KEY].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the statement timing listeners to ``engine`` (idempotent)."""
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@dataclass
+class RouteQueryTotals:
+    """Accumulated statement statistics for one route."""
+
+    requests: int = 0
+    statements: int = 0
+    total_seconds: float = 0.0
+    max_statements: int = 0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = field(default=None)
+
+
+class QueryMetrics:
+    """Thread-safe per-route aggregation of :class:`QueryStats`."""
+
+    def __init__(self) -> None:
+        self._routes: dict[str, RouteQueryTotals] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, stats: QueryStats) -> None:
+        """Fold the statistics of one request into the totals for ``route``."""
+
+        with self._lock:
+            totals = self._routes.setdefault(route, RouteQueryTotals())
+            totals.requests += 1
+            totals.statements += stats.count
+            totals.total_seconds += stats.total_seconds
+            totals.max_statements = max(totals.max_statements, stats.count)
+            if stats.slowest_seconds >= totals.slowest_seconds:
+                totals.slowest_seconds = stats.slowest_seconds
+                totals.slowest_statement = stats.slowest_statement
+
+    def clear(self) -> None:
+        """Forget every recorded route."""
+
+        with self._lock:
+            self._routes.clear()
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """Return per-route averages and maxima for the metrics endpoint."""
+
+        with self._lock:
+            return {
+                route: {
+                    "requests": totals.requests,
+                    "avg_statements": round(totals.statements / totals.requests, 2),
+                    "max_statements": totals.max_statements,
+                    "avg_db_ms": round(totals.total_seconds / totals.requests * 1000, 2),
+                    "slowest_ms": round(totals.slowest_seconds * 1000, 2),
+                    "slowest_statement": totals.slowest_statement,
+                }
+                for route, totals in sorted(self._routes.items())
+            }
+
+
+query_metrics = QueryMetrics()
+
+
+__all__ = [
+    "QueryMetrics",
+    "QueryStats",
+    "RouteQueryTotals",
+    "collect_query_stats",
+    "instrument_engine",
+    "query_metrics",
+]
@@ -0,0 +1,56 @@
+"""SQL helpers for reading subtask submission history newest first.
+
+Both the plan page and the review queue only show a subtask's latest
+submission; these queries rank submissions in the database over the
+``(subtask_id, created_at)`` index instead of loading every row.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from typing import Any
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models.tasks import SubtaskSubmission
+
+SUBMISSIONS_NEWEST_FIRST = (SubtaskSubmission.created_at.desc(), SubtaskSubmission.id.desc())
+
+
+def latest_submissions(
+    session: Session, subtask_ids: Collection[int], *options: Any
+) -> dict[int, tuple[SubtaskSubmission, int]]:
+    """Return each subtask's newest submission and its submission count.
+
+    ``options`` are loader options applied to the submissions, e.g. to
+    eager-load the submitter.
+    """
+
+    if not subtask_ids:
+        return {}
+
+    ranked = (
+        select(
+            SubtaskSubmission.id,
+            func.row_number()
+            .over(
+                partition_by=SubtaskSubmission.subtask_id,
+                order_by=SUBMISSIONS_NEWEST_FIRST,
+            )
+            .label("position"),
+            func.count().over(partition_by=SubtaskSubmission.subtask_id).label("total"),
+        )
+        .where(SubtaskSubmission.subtask_id.in_(subtask_ids))
+        .subquery()
+    )
+    rows = session.exec(
+        select(SubtaskSubmission, ranked.c.total)
+        .join(ranked, ranked.c.id == SubtaskSubmission.id)
+        .where(ranked.c.position == 1)
+        .options(*options)
+    ).all()
+    return {submission.subtask_id: (submission, total) for submission, total in rows}
+
+
+__all__ = ["SUBMISSIONS_NEWEST_FIRST", "latest_submissions"]
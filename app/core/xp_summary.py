@@ -0,0 +1,136 @@
+"""Maintenance of the materialized per-user XP summaries."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+
+from app.core.xp import calculate_level, reason_label
+from app.models.users import User
+from app.models.xp import UserXPSummary, XPEvent
+
+RECENT_EVENT_LIMIT = 5
+
+
+def _event_entry(event: XPEvent) -> dict[str, Any]:
+    return {
+        "reason": event.reason,
+        "delta": event.delta,
+        "created_at": event.created_at.isoformat(),
+    }
+
+
+def record_xp_events(session: Session, events: Iterable[XPEvent]) -> None:
+    """Fold newly added ``events`` into their users' summaries.
+
+    Call this in the transaction that adds the events. The pending inserts
+    are flushed first so the summary row is read while the transaction
+    already holds SQLite's write lock, keeping concurrent approvals for the
+    same user from overwriting each other's totals.
+    """
+
+    events_by_user: dict[int, list[XPEvent]] = defaultdict(list)
+    for event in events:
+        events_by_user[event.user_id].append(event)
+    if not events_by_user:
+        return
+
+    session.flush()
+    now = datetime.utcnow()
+    for user_id, user_events in events_by_user.items():
+        summary = session.get(UserXPSummary, user_id, populate_existing=True)
+        if summary is None:
+            summary = UserXPSummary(user_id=user_id)
+
+        newest_first = sorted(user_events, key=lambda event: event.created_at, reverse=True)
+        summary.total_xp += sum(event.delta for event in user_events)
+        summary.level = calculate_level(summary.total_xp)
+        summary.recent_events = [
+            *(_event_entry(event) for event in newest_first),
+            *summary.recent_events,
+        ][:RECENT_EVENT_LIMIT]
+        summary.updated_at = now
+        session.add(summary)
+
+
+def rebuild_xp_summaries(session: Session) -> int:
+    """Recompute every user's summary from the XP ledger.
+
+    Returns the number of summaries written. The caller commits.
+    """
+
+    totals = dict(
+        session.exec(
+            select(XPEvent.user_id, func.coalesce(func.sum(XPEvent.delta), 0)).group_by(
+                XPEvent.user_id
+            )
+        ).all()
+    )
+
+    ranked = (
+        select(
+            XPEvent.id,
+            func.row_number()
+            .over(
+                partition_by=XPEvent.user_id,
+                order_by=(XPEvent.created_at.desc(), XPEvent.id.desc()),
+            )
+            .label("position"),
+        )
+    ).subquery()
+    recent_rows = session.exec(
+        select(XPEvent)
+        .join(ranked, ranked.c.id == XPEvent.id)
+        .where(ranked.c.position <= RECENT_EVENT_LIMIT)
+        .order_by(XPEvent.user_id, ranked.c.position)
+    ).all()
+    recent: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    for event in recent_rows:
+        recent[event.user_id].append(_event_entry(event))
+
+    session.exec(delete(UserXPSummary))
+    now = datetime.utcnow()
+    user_ids = session.exec(select(User.id)).all()
+    for user_id in user_ids:
+        total_xp = int(totals.get(user_id, 0))
+        session.add(
+            UserXPSummary(
+                user_id=user_id,
+                total_xp=total_xp,
+                level=calculate_level(total_xp),
+                recent_events=recent.get(user_id, []),
+                updated_at=now,
+            )
+        )
+    session.flush()
+    return len(user_ids)
+
+
+def xp_history(summary: UserXPSummary | None) -> list[dict[str, Any]]:
+    """Return template-ready recent events stored on ``summary``."""
+
+    if summary is None:
+        return []
+
+    return [
+        {
+            "reason": entry["reason"],
+            "label": reason_label(entry["reason"]),
+            "delta": entry["delta"],
+            "created_at": datetime.fromisoformat(entry["created_at"]),
+        }
+        for entry in summary.recent_events
+    ]
+
+
+__all__ = [
+    "RECENT_EVENT_LIMIT",
+    "rebuild_xp_summaries",
+    "record_xp_events",
+    "xp_history",
+]
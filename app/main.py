@@ -1,18 +1,91 @@
 """FastAPI application entrypoint for the Family Task Portal."""
 
+import asyncio
+import signal
+import threading
+from collections.abc import Callable
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.api.admin import router as admin_router
+from app.api.events import router as events_router
 from app.api.public import router as public_router
 from app.api.review import router as review_router
 from app.api.uploads import router as uploads_router
 from app.core.config import settings
-from app.core.device import COOKIE_NAME, ensure_device_cookie
+from app.core.db import async_engine
+from app.core.device import COOKIE_NAME, device_cookie_value, ensure_device_cookie
+from app.core.device_touch import device_touches
+from app.core.events import event_broadcaster
+from app.core.query_stats import collect_query_stats, query_metrics
+
+
+async def _flush_device_touches_periodically() -> None:
+    """Write buffered device sightings every ``flush_interval`` seconds."""
+
+    while True:
+        await asyncio.sleep(device_touches.flush_interval)
+        await run_in_threadpool(device_touches.flush)
+
+
+def _close_event_streams_on_exit_signal() -> Callable[[], None]:
+    """Close event streams as soon as the server is asked to shut down.
+
+    Uvicorn waits for open responses to finish before it runs the lifespan
+    shutdown, and an ``/events`` stream only finishes when its subscription
+    is closed. The server's SIGINT/SIGTERM handlers are wrapped so the
+    streams end first and the shutdown below (final device-touch flush,
+    engine disposal) runs. Returns a callable restoring the handlers.
+    """
+
+    if threading.current_thread() is not threading.main_thread():
+        return lambda: None
+
+    previous_handlers = {}
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        handler = signal.getsignal(sig)
+        if not callable(handler):
+            continue
+
+        def close_streams(signum, frame, _handler=handler):
+            event_broadcaster.close_soon()
+            _handler(signum, frame)
+
+        previous_handlers[sig] = handler
+        signal.signal(sig, close_streams)
 
-app = FastAPI(title="Family Task Portal")
+    def restore() -> None:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+
+    return restore
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background maintenance tasks for the lifetime of the application."""
+
+    event_broadcaster.open()
+    restore_signal_handlers = _close_event_streams_on_exit_signal()
+    flusher = asyncio.create_task(_flush_device_touches_periodically())
+    try:
+        yield
+    finally:
+        restore_signal_handlers()
+        event_broadcaster.close()
+        flusher.cancel()
+        with suppress(asyncio.CancelledError):
+            await flusher
+        await run_in_threadpool(device_touches.flush)
+        await async_engine.dispose()
+
+
+app = FastAPI(title="Family Task Portal", lifespan=lifespan)
 app.add_middleware(SessionMiddleware, secret_key=settings.session_secret)
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -23,13 +96,14 @@ templates = Jinja2Templates(directory="app/templates")
 @app.middleware("http")
 async def device_cookie_middleware(request: Request, call_next):
     """Ensure each device interacting with the app has an identifying cookie."""
-    device, cookie_missing = ensure_device_cookie(request)
+    device, issue_cookie = await ensure_device_cookie(request)
     request.state.device = device
     response: Response = await call_next(request)
-    if cookie_missing:
+    cookie_value = device_cookie_value(device, issue_cookie)
+    if cookie_value is not None:
         response.set_cookie(
             COOKIE_NAME,
-            device.id,
+            cookie_value,
             httponly=True,
             samesite="lax",
             secure=False,
@@ -38,10 +112,24 @@ async def device_cookie_middleware(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def query_stats_middleware(request: Request, call_next):
+    """Record the SQL statements issued while handling each request."""
+    with collect_query_stats() as stats:
+        response: Response = await call_next(request)
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", None) or "<unmatched>"
+    query_metrics.record(f"{request.method} {route_path}", stats)
+    if settings.query_debug_headers:
+        response.headers.update(stats.as_headers())
+    return response
+
+
 app.include_router(public_router)
 app.include_router(review_router)
 app.include_router(admin_router)
 app.include_router(uploads_router)
+app.include_router(events_router)
 
 
 @app.get("/health")
@@ -31,6 +31,7 @@ class Device(BaseModel, table=True):
         default_factory=datetime.utcnow, sa_column_kwargs={"nullable": False}
     )
     last_seen_at: datetime | None = Field(default=None)
+    token_version: int = Field(default=1, ge=1, sa_column_kwargs={"nullable": False})
 
     linked_user: "User" | None = Relationship(back_populates="devices")
     submissions: list["SubtaskSubmission"] = Relationship(
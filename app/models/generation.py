@@ -0,0 +1,18 @@
+"""SQLModel declaration for the global data-generation counter."""
+
+from __future__ import annotations
+
+from sqlmodel import Field
+
+from .base import BaseModel
+
+DATA_GENERATION_ROW_ID = 1
+
+
+class DataGeneration(BaseModel, table=True):
+    """Single-row counter incremented by every committed ORM write."""
+
+    __tablename__ = "data_generation"
+
+    id: int = Field(default=DATA_GENERATION_ROW_ID, primary_key=True)
+    value: int = Field(default=0, ge=0, sa_column_kwargs={"nullable": False})
@@ -43,6 +43,10 @@ class Plan(BaseModel, table=True):
         default_factory=datetime.utcnow, sa_column_kwargs={"nullable": False}
     )
     total_xp: int = Field(default=0, ge=0, sa_column_kwargs={"nullable": False})
+    approved_count: int = Field(default=0, ge=0, sa_column_kwargs={"nullable": False})
+    total_count: int = Field(default=0, ge=0, sa_column_kwargs={"nullable": False})
+    completed_day_count: int = Field(default=0, ge=0, sa_column_kwargs={"nullable": False})
+    day_count: int = Field(default=0, ge=0, sa_column_kwargs={"nullable": False})
 
     assignee: "User" = Relationship(
         back_populates="assigned_plans",
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlmodel import Field, Relationship
 
 from .base import BaseModel
@@ -26,6 +26,8 @@ class PlanDay(BaseModel, table=True):
     day_index: int = Field(ge=0, sa_column_kwargs={"nullable": False})
     title: str = Field(max_length=200)
     locked: bool = Field(default=True, sa_column_kwargs={"nullable": False})
+    approved_count: int = Field(default=0, ge=0, sa_column_kwargs={"nullable": False})
+    total_count: int = Field(default=0, ge=0, sa_column_kwargs={"nullable": False})
     created_at: datetime = Field(
         default_factory=datetime.utcnow, sa_column_kwargs={"nullable": False}
     )
@@ -88,6 +90,10 @@ class Subtask(BaseModel, table=True):
 class SubtaskSubmission(BaseModel, table=True):
     """Evidence submitted for a subtask."""
 
+    __table_args__ = (
+        Index("ix_subtask_submission_subtask_created", "subtask_id", "created_at"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     subtask_id: int = Field(
         sa_column=Column(
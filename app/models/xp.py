@@ -1,9 +1,11 @@
-"""SQLModel declaration for XP events earned by users."""
+"""SQLModel declarations for XP events and per-user XP summaries."""
 
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Column, ForeignKey, Integer, String
+from typing import Any
+
+from sqlalchemy import JSON, Column, ForeignKey, Integer, String
 from sqlmodel import Field, Relationship
 
 from .base import BaseModel
@@ -30,3 +32,23 @@ class XPEvent(BaseModel, table=True):
 
     user: "User" = Relationship(back_populates="xp_events")
     subtask: "Subtask" | None = Relationship(back_populates="xp_events")
+
+
+class UserXPSummary(BaseModel, table=True):
+    """Running XP totals per user, maintained alongside the XP ledger."""
+
+    __tablename__ = "user_xp_summary"
+
+    user_id: int = Field(
+        sa_column=Column(
+            Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+        )
+    )
+    total_xp: int = Field(default=0, sa_column_kwargs={"nullable": False})
+    level: int = Field(default=0, ge=0, sa_column_kwargs={"nullable": False})
+    recent_events: list[dict[str, Any]] = Field(
+        default_factory=list, sa_column=Column(JSON, nullable=False)
+    )
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, sa_column_kwargs={"nullable": False}
+    )
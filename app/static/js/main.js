@@ -1 +1,56 @@
-// Placeholder JavaScript entrypoint for the Family Portal frontend.
+// Family Portal frontend entrypoint.
+
+// Fragments also poll on a slow timer (see app/core/etag.py). Skip the swap
+// when a fragment's ETag is unchanged so open days and typed input survive.
+document.body.addEventListener("htmx:beforeSwap", (event) => {
+  const etag = event.detail.xhr.getResponseHeader("ETag");
+  const target = event.detail.target;
+  if (!etag || !target) {
+    return;
+  }
+  if (target.dataset.etag === etag) {
+    event.detail.shouldSwap = false;
+    return;
+  }
+  target.dataset.etag = etag;
+});
+
+// Relay server-sent domain events (see app/api/events.py) to <body> so
+// HTMX elements can refresh with `hx-trigger="<event> from:body"`.
+(function () {
+  const url = document.body.dataset.eventsUrl;
+  if (!url || !("EventSource" in window)) {
+    return;
+  }
+
+  const emit = (name, detail) =>
+    document.body.dispatchEvent(new CustomEvent(name, { detail: detail }));
+  const source = new EventSource(url);
+
+  // Write responses already swap their results into this page out of band,
+  // so tag our requests and skip the events they publish.
+  const clientId = Math.random().toString(36).slice(2) + Date.now().toString(36);
+  document.body.addEventListener("htmx:configRequest", (event) => {
+    event.detail.headers["X-Client-Id"] = clientId;
+  });
+
+  ["planProgressUpdated", "reviewQueueRefresh", "devicesUpdated"].forEach((name) => {
+    source.addEventListener(name, (event) => {
+      const detail = JSON.parse(event.data);
+      if (detail.origin !== clientId) {
+        emit(name, detail);
+      }
+    });
+  });
+
+  // Events sent while disconnected, or dropped for a slow client, are lost:
+  // refresh everything once the stream is back.
+  source.addEventListener("resync", () => emit("eventsResync", {}));
+  let connectedBefore = false;
+  source.addEventListener("open", () => {
+    if (connectedBefore) {
+      emit("eventsResync", {});
+    }
+    connectedBefore = true;
+  });
+})();
@@ -0,0 +1,5 @@
+"""Performance benchmarks for the Family Portal application.
+
+Each module is runnable with ``python -m benchmarks.<name>`` and drives the
+FastAPI application in-process against a throwaway SQLite database.
+"""
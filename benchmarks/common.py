@@ -0,0 +1,92 @@
+"""Shared helpers for the benchmark scripts."""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import pkgutil
+import statistics
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+SAMPLE_PLAN_MARKDOWN = """# Benchmark Plan
+
+## Day 1 – Warm up
+- [ ] Stretch (10 XP)
+- [ ] Drink water (5 XP)
+
+## Day 2 – Practice
+- [ ] Read a chapter (15 XP)
+- [ ] Tidy the desk (10 XP)
+
+## Day 3 – Wrap up
+- [ ] Share what you learned (20 XP)
+"""
+
+
+def configure_environment(workdir: str | None = None) -> Path:
+    """Point the application at a scratch database and upload directory.
+
+    Must run before any ``app`` module is imported because settings are read
+    at import time. Returns the directory holding the scratch files.
+    """
+
+    root = Path(workdir or tempfile.mkdtemp(prefix="fp-bench-"))
+    root.mkdir(parents=True, exist_ok=True)
+    os.environ["FP_DB_URL"] = f"sqlite:///{root / 'bench.db'}"
+    os.environ["FP_UPLOADS_DIR"] = str(root / "uploads")
+    os.environ["FP_THUMBS_DIR"] = str(root / "uploads" / "thumbs")
+    return root
+
+
+def create_schema(bind=None) -> None:
+    """Create every application table on ``bind`` or the configured engine."""
+
+    import app.models
+    from sqlmodel import SQLModel
+
+    from app.core.db import engine
+
+    for module_info in pkgutil.walk_packages(app.models.__path__, "app.models."):
+        importlib.import_module(module_info.name)
+    SQLModel.metadata.drop_all(bind or engine)
+    SQLModel.metadata.create_all(bind or engine)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Return the ``pct`` percentile of ``values`` using linear interpolation."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * (pct / 100)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_latencies(latencies: Sequence[float], elapsed: float) -> dict[str, float]:
+    """Return latency percentiles (milliseconds) and throughput for a run."""
+
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def write_results(path: str | None, payload: dict[str, Any]) -> None:
+    """Print ``payload`` and optionally persist it as JSON at ``path``."""
+
+    rendered = json.dumps(payload, indent=2, sort_keys=True, default=str)
+    print(rendered)
+    if path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(rendered + "\n", encoding="utf-8")
@@ -0,0 +1,243 @@
+"""Reproducible synthetic family dataset for benchmarks.
+
+:func:`generate_dataset` fills the configured database with users, devices,
+plans, days, subtasks, submissions, approvals, XP events and activity rows.
+The shape is controlled by :class:`DatasetSpec` and every random choice comes
+from a seeded :class:`random.Random`, so the same spec always produces the
+same rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Scale parameters for the generated dataset."""
+
+    users: int = 4
+    plans_per_user: int = 3
+    days_per_plan: int = 5
+    subtasks_per_day: int = 4
+    submissions_per_subtask: int = 2
+    xp_events_per_user: int = 40
+    activity_rows: int = 500
+    devices: int = 6
+    seed: int = 1234
+
+    @classmethod
+    def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        """Register one ``--option`` per field on ``parser``."""
+
+        for name, default in asdict(cls()).items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                type=int,
+                default=default,
+                help=f"Dataset {name.replace('_', ' ')} (default: {default}).",
+            )
+
+    @classmethod
+    def from_namespace(cls, args: argparse.Namespace) -> "DatasetSpec":
+        """Build a spec from arguments registered by :meth:`add_arguments`."""
+
+        return cls(**{name: getattr(args, name) for name in asdict(cls())})
+
+
+@dataclass
+class DatasetSummary:
+    """Identifiers and row counts of a generated dataset."""
+
+    user_ids: list[int] = field(default_factory=list)
+    plan_ids: list[int] = field(default_factory=list)
+    device_ids: list[str] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+def generate_dataset(spec: DatasetSpec, bind=None) -> DatasetSummary:
+    """Insert a dataset shaped by ``spec`` and return its summary.
+
+    Each user's most recent plan is in progress with its first days
+    approved, the current day awaiting review and later days locked. Older
+    plans are complete, so the board, plan, review and activity views all
+    have realistic data to render.
+    """
+
+    from sqlmodel import Session
+
+    from app.core.db import engine
+    from app.core.progress_counters import recount_progress
+    from app.core.xp_summary import rebuild_xp_summaries
+    from app.models.activity import ActivityLog
+    from app.models.approvals import Approval, ApprovalAction, ApprovalMood
+    from app.models.devices import Device
+    from app.models.plans import Plan, PlanStatus
+    from app.models.tasks import PlanDay, Subtask, SubtaskStatus, SubtaskSubmission
+    from app.models.users import User, UserRole
+    from app.models.xp import XPEvent
+
+    rng = random.Random(spec.seed)
+    started = datetime(2025, 1, 1, 8, 0, 0)
+    summary = DatasetSummary()
+    counts = {
+        name: 0
+        for name in (
+            "users",
+            "devices",
+            "plans",
+            "days",
+            "subtasks",
+            "submissions",
+            "approvals",
+            "xp_events",
+            "activity_rows",
+        )
+    }
+
+    with Session(bind or engine) as session:
+        admin = User(display_name="Parent", role=UserRole.ADMIN)
+        session.add(admin)
+        users = [User(display_name=f"Member {index + 1:03d}") for index in range(spec.users)]
+        session.add_all(users)
+        session.flush()
+        counts["users"] = len(users) + 1
+
+        devices = [
+            Device(
+                id=f"00000000-0000-4000-8000-{index:012d}",
+                friendly_name=f"Tablet {index + 1}",
+                linked_user_id=rng.choice([None, admin.id, *(user.id for user in users)]),
+                created_at=started,
+                last_seen_at=started,
+            )
+            for index in range(max(spec.devices, 1))
+        ]
+        session.add_all(devices)
+        session.flush()
+        counts["devices"] = len(devices)
+        summary.device_ids = [device.id for device in devices]
+
+        clock = started
+        for user in users:
+            for plan_index in range(spec.plans_per_user):
+                is_current = plan_index == spec.plans_per_user - 1
+                clock += timedelta(hours=1)
+                plan = Plan(
+                    title=f"{user.display_name} plan {plan_index + 1}",
+                    assignee_user_id=user.id,
+                    created_by_user_id=admin.id,
+                    status=PlanStatus.IN_PROGRESS if is_current else PlanStatus.COMPLETE,
+                    created_at=clock,
+                    updated_at=clock,
+                )
+                session.add(plan)
+                session.flush()
+                counts["plans"] += 1
+                summary.plan_ids.append(plan.id)
+
+                current_day = rng.randrange(spec.days_per_plan) if is_current else None
+                for day_index in range(spec.days_per_plan):
+                    day = PlanDay(
+                        plan_id=plan.id,
+                        day_index=day_index,
+                        title=f"Day {day_index + 1}",
+                        locked=current_day is not None and day_index > current_day,
+                    )
+                    session.add(day)
+                    session.flush()
+                    counts["days"] += 1
+
+                    for order_index in range(spec.subtasks_per_day):
+                        if current_day is None or day_index < current_day:
+                            status = SubtaskStatus.APPROVED
+                        elif day_index == current_day:
+                            status = rng.choice(list(SubtaskStatus))
+                        else:
+                            status = SubtaskStatus.PENDING
+                        subtask = Subtask(
+                            plan_day_id=day.id,
+                            order_index=order_index,
+                            text=f"Task {day_index + 1}.{order_index + 1}",
+                            xp_value=rng.choice((5, 10, 15, 20)),
+                            status=status,
+                        )
+                        session.add(subtask)
+                        session.flush()
+                        counts["subtasks"] += 1
+
+                        if status == SubtaskStatus.PENDING:
+                            continue
+                        for submission_index in range(spec.submissions_per_subtask):
+                            device = rng.choice(devices)
+                            clock += timedelta(minutes=7)
+                            session.add(
+                                SubtaskSubmission(
+                                    subtask_id=subtask.id,
+                                    submitted_by_device_id=device.id,
+                                    submitted_by_user_id=user.id,
+                                    comment=f"Attempt {submission_index + 1}",
+                                    created_at=clock,
+                                )
+                            )
+                            counts["submissions"] += 1
+                        if status in {SubtaskStatus.APPROVED, SubtaskStatus.DENIED}:
+                            session.add(
+                                Approval(
+                                    subtask_id=subtask.id,
+                                    action=ApprovalAction.APPROVE
+                                    if status == SubtaskStatus.APPROVED
+                                    else ApprovalAction.DENY,
+                                    mood=rng.choice(list(ApprovalMood)),
+                                    acted_by_device_id=devices[0].id,
+                                    acted_by_user_id=admin.id,
+                                    created_at=clock,
+                                )
+                            )
+                            counts["approvals"] += 1
+
+        for user in users:
+            for _ in range(spec.xp_events_per_user):
+                clock += timedelta(minutes=3)
+                session.add(
+                    XPEvent(
+                        user_id=user.id,
+                        delta=rng.choice((5, 10, 15, 20)),
+                        reason="subtask_approved",
+                        created_at=clock,
+                    )
+                )
+                counts["xp_events"] += 1
+
+        for index in range(spec.activity_rows):
+            device = rng.choice(devices)
+            clock += timedelta(minutes=1)
+            session.add(
+                ActivityLog(
+                    timestamp=clock,
+                    device_id=device.id,
+                    user_id=device.linked_user_id,
+                    action=rng.choice(
+                        ("subtask.submitted", "subtask.approved", "subtask.denied")
+                    ),
+                    entity_type="subtask",
+                    entity_id=index + 1,
+                    metadata_payload={"sequence": index},
+                )
+            )
+            counts["activity_rows"] += 1
+
+        session.flush()
+        rebuild_xp_summaries(session)
+        recount_progress(session)
+        session.commit()
+        summary.user_ids = [admin.id, *(user.id for user in users)]
+
+    summary.counts = counts
+    return summary
+
+
+__all__ = ["DatasetSpec", "DatasetSummary", "generate_dataset"]
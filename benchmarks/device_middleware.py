@@ -0,0 +1,187 @@
+"""Compare board-poll latency with blocking and threadpool device resolution.
+
+The ``blocking`` variant reproduces the original middleware, which looked up
+and committed the device row on the event loop thread for every request. The
+``current`` variant uses :func:`app.main.device_cookie_middleware`. Both run
+the same workload: several tablets polling the board summary partial while
+cookie-less clients (health checks, link previews) register new devices.
+
+Usage::
+
+    python -m benchmarks.device_middleware --tablets 8 --polls 40 --fsync-delay-ms 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import (
+    SAMPLE_PLAN_MARKDOWN,
+    configure_environment,
+    create_schema,
+    summarize_latencies,
+    write_results,
+)
+
+
+def _seed(users: int) -> None:
+    from sqlmodel import Session
+
+    from app.core.db import engine
+    from app.core.markdown_import import import_markdown_plan
+    from app.models.users import User
+
+    with Session(engine) as session:
+        for index in range(users):
+            user = User(display_name=f"Member {index + 1}")
+            session.add(user)
+            session.flush()
+            import_markdown_plan(SAMPLE_PLAN_MARKDOWN, user.id, session)
+        session.commit()
+
+
+async def _blocking_device_middleware(request, call_next):
+    """Baseline middleware: synchronous lookup and commit on the event loop."""
+
+    import uuid
+    from datetime import datetime
+
+    from sqlmodel import Session
+
+    from app.core.db import engine
+    from app.core.device import COOKIE_NAME
+    from app.models.devices import Device
+
+    device_id = request.cookies.get(COOKIE_NAME)
+    cookie_missing = device_id is None
+    if cookie_missing:
+        device_id = str(uuid.uuid4())
+
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        device = session.get(Device, device_id)
+        if device is None:
+            device = Device(id=device_id, created_at=now)
+            session.add(device)
+        device.last_seen_at = now
+        session.add(device)
+        session.commit()
+        session.refresh(device)
+
+    request.state.device = device
+    response = await call_next(request)
+    if cookie_missing:
+        response.set_cookie(COOKIE_NAME, device.id, httponly=True, samesite="lax")
+    return response
+
+
+def _build_app(mode: str):
+    from fastapi import FastAPI
+    from fastapi.staticfiles import StaticFiles
+
+    from app.main import app as portal_app
+    from app.main import device_cookie_middleware
+
+    bench_app = FastAPI()
+    bench_app.mount("/static", StaticFiles(directory="app/static"), name="static")
+    bench_app.router.routes.extend(
+        route for route in portal_app.router.routes if route.path != "/static"
+    )
+    middleware = (
+        _blocking_device_middleware if mode == "blocking" else device_cookie_middleware
+    )
+    bench_app.middleware("http")(middleware)
+    return bench_app
+
+
+async def _run_workload(bench_app, *, tablets: int, polls: int, newcomers: int):
+    import httpx
+
+    transport = httpx.ASGITransport(app=bench_app)
+    latencies: list[float] = []
+
+    async def tablet() -> None:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.get("/")
+            for _ in range(polls):
+                started = time.perf_counter()
+                response = await client.get(
+                    "/?partial=plan-summary", headers={"HX-Request": "true"}
+                )
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+    async def newcomer() -> None:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for _ in range(polls):
+                client.cookies.clear()
+                await client.get("/health")
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(tablet() for _ in range(tablets)),
+        *(newcomer() for _ in range(newcomers)),
+    )
+    return summarize_latencies(latencies, time.perf_counter() - started)
+
+
+def run(args: argparse.Namespace) -> dict:
+    configure_environment(args.workdir)
+
+    from sqlalchemy import event
+
+    from app.core.db import engine
+    from app.core.device_cache import device_cache
+
+    if args.fsync_delay_ms:
+        delay = args.fsync_delay_ms / 1000
+
+        @event.listens_for(engine, "commit")
+        def _simulate_slow_storage(connection) -> None:
+            time.sleep(delay)
+
+    results: dict[str, dict] = {}
+    for mode in ("blocking", "current"):
+        create_schema()
+        _seed(args.users)
+        device_cache.clear()
+        results[mode] = asyncio.run(
+            _run_workload(
+                _build_app(mode),
+                tablets=args.tablets,
+                polls=args.polls,
+                newcomers=args.newcomers,
+            )
+        )
+
+    return {
+        "benchmark": "device_middleware",
+        "parameters": vars(args),
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tablets", type=int, default=8, help="Concurrent board pollers.")
+    parser.add_argument("--polls", type=int, default=40, help="Polls per tablet.")
+    parser.add_argument(
+        "--newcomers", type=int, default=2, help="Concurrent cookie-less clients."
+    )
+    parser.add_argument("--users", type=int, default=4, help="Family members to seed.")
+    parser.add_argument(
+        "--fsync-delay-ms",
+        type=float,
+        default=10.0,
+        help="Artificial delay per commit to mimic SD-card fsync latency.",
+    )
+    parser.add_argument("--workdir", help="Directory for the scratch database.")
+    parser.add_argument("--output", help="Write the JSON results to this path.")
+    args = parser.parse_args(argv)
+    write_results(args.output, run(args))
+
+
+if __name__ == "__main__":
+    main()
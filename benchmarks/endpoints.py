@@ -0,0 +1,161 @@
+"""Load-test the board, plan, review and activity endpoints in-process.
+
+A synthetic dataset from :mod:`benchmarks.dataset` is generated in a scratch
+database, then concurrent clients drive the application through
+``httpx.ASGITransport``. Latency percentiles and throughput are reported per
+endpoint together with the git commit, so JSON results from different
+commits can be compared with ``--compare``.
+
+Usage::
+
+    python -m benchmarks.endpoints --users 8 --clients 4 --requests 50 \\
+        --output results/endpoints-$(git rev-parse --short HEAD).json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.common import (
+    configure_environment,
+    create_schema,
+    summarize_latencies,
+    write_results,
+)
+from benchmarks.dataset import DatasetSpec, generate_dataset
+
+ENDPOINTS: dict[str, tuple[str, bool]] = {
+    "board": ("/", False),
+    "board_plan_summary": ("/?partial=plan-summary", True),
+    "board_user_cards": ("/?partial=user-cards", True),
+    "plan": ("/plan/{plan_id}", False),
+    "plan_days": ("/plan/{plan_id}/partials/days", True),
+    "plan_progress": ("/plan/{plan_id}/partials/progress", True),
+    "review": ("/review", False),
+    "review_queue": ("/review/partials/queue", True),
+    "activity": ("/admin/activity", False),
+}
+
+
+def git_commit() -> str | None:
+    """Return the checked-out commit, or ``None`` outside a git checkout."""
+
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+async def _measure(app, path: str, *, htmx: bool, clients: int, requests: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    headers = {"HX-Request": "true"} if htmx else {}
+    latencies: list[float] = []
+
+    async def client_loop() -> None:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            (await client.get(path, headers=headers)).raise_for_status()
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(clients)))
+    return summarize_latencies(latencies, time.perf_counter() - started)
+
+
+def compare(previous: dict, current: dict) -> dict[str, dict[str, float]]:
+    """Return per-endpoint p50/p95/p99 deltas (ms) between two result files."""
+
+    deltas: dict[str, dict[str, float]] = {}
+    for name, result in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if before is None:
+            continue
+        deltas[name] = {
+            key: round(result[key] - before[key], 2)
+            for key in ("p50_ms", "p95_ms", "p99_ms")
+        }
+    return deltas
+
+
+def run(args: argparse.Namespace) -> dict:
+    configure_environment(args.workdir)
+
+    from app.main import app
+
+    create_schema()
+    spec = DatasetSpec.from_namespace(args)
+    dataset = generate_dataset(spec)
+    plan_id = dataset.plan_ids[-1]
+
+    selected = args.endpoint or list(ENDPOINTS)
+    results = {}
+    for name in selected:
+        template, htmx = ENDPOINTS[name]
+        results[name] = asyncio.run(
+            _measure(
+                app,
+                template.format(plan_id=plan_id),
+                htmx=htmx,
+                clients=args.clients,
+                requests=args.requests,
+            )
+        )
+
+    payload = {
+        "benchmark": "endpoints",
+        "commit": git_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "parameters": {
+            "clients": args.clients,
+            "requests": args.requests,
+            "dataset": vars(spec),
+        },
+        "dataset": dataset.counts,
+        "results": results,
+    }
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        payload["compared_to"] = previous.get("commit")
+        payload["delta_ms"] = compare(previous, payload)
+    return payload
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients.")
+    parser.add_argument(
+        "--requests", type=int, default=50, help="Requests per client and endpoint."
+    )
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        choices=sorted(ENDPOINTS),
+        help="Endpoint to measure (repeatable). Defaults to all of them.",
+    )
+    DatasetSpec.add_arguments(parser)
+    parser.add_argument("--workdir", help="Directory for the scratch database.")
+    parser.add_argument("--output", help="Write the JSON results to this path.")
+    parser.add_argument("--compare", help="Earlier JSON result to diff against.")
+    args = parser.parse_args(argv)
+    write_results(args.output, run(args))
+
+
+if __name__ == "__main__":
+    main()
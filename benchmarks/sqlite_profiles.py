@@ -0,0 +1,179 @@
+"""Measure SQLite read/write throughput under each connection profile.
+
+Reader threads repeatedly load the board's subtask status counts while writer
+threads record submissions (a subtask status update plus an activity log row
+per transaction). Each profile from :data:`app.core.db.SQLITE_PROFILES` runs
+against its own fresh database file; ``database is locked`` errors are
+counted rather than retried.
+
+Usage::
+
+    python -m benchmarks.sqlite_profiles --readers 6 --writers 2 --operations 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.common import (
+    SAMPLE_PLAN_MARKDOWN,
+    configure_environment,
+    create_schema,
+    summarize_latencies,
+    write_results,
+)
+
+
+def _seed(engine, users: int) -> list[int]:
+    from sqlmodel import Session, select
+
+    from app.core.markdown_import import import_markdown_plan
+    from app.models.tasks import Subtask
+    from app.models.users import User
+
+    with Session(engine) as session:
+        for index in range(users):
+            user = User(display_name=f"Member {index + 1}")
+            session.add(user)
+            session.flush()
+            import_markdown_plan(SAMPLE_PLAN_MARKDOWN, user.id, session)
+        session.commit()
+        return list(session.exec(select(Subtask.id)))
+
+
+def _read_board(engine) -> None:
+    from sqlalchemy import func
+    from sqlmodel import Session, select
+
+    from app.models.plans import Plan
+    from app.models.tasks import PlanDay, Subtask
+
+    with Session(engine) as session:
+        session.exec(
+            select(Plan.id, Subtask.status, func.count(Subtask.id))
+            .join(PlanDay, PlanDay.plan_id == Plan.id)
+            .join(Subtask, Subtask.plan_day_id == PlanDay.id)
+            .group_by(Plan.id, Subtask.status)
+        ).all()
+
+
+def _write_submission(engine, subtask_id: int) -> None:
+    from sqlmodel import Session
+
+    from app.models.activity import ActivityLog
+    from app.models.tasks import Subtask, SubtaskStatus
+
+    with Session(engine) as session:
+        subtask = session.get(Subtask, subtask_id)
+        subtask.status = (
+            SubtaskStatus.PENDING
+            if subtask.status == SubtaskStatus.SUBMITTED
+            else SubtaskStatus.SUBMITTED
+        )
+        session.add(subtask)
+        session.add(
+            ActivityLog(
+                action="subtask.submitted", entity_type="subtask", entity_id=subtask_id
+            )
+        )
+        session.commit()
+
+
+def _run_profile(profile: str, root: Path, args: argparse.Namespace) -> dict:
+    from sqlalchemy.exc import OperationalError
+
+    from app.core.db import build_engine
+
+    db_path = root / f"{profile}.db"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    engine = build_engine(f"sqlite:///{db_path}", sqlite_profile=profile)
+    create_schema(engine)
+    subtask_ids = _seed(engine, args.users)
+
+    reads: list[float] = []
+    writes: list[float] = []
+    locked = {"reads": 0, "writes": 0}
+    lock = threading.Lock()
+
+    def worker(kind: str, offset: int) -> None:
+        for index in range(args.operations):
+            started = time.perf_counter()
+            try:
+                if kind == "reads":
+                    _read_board(engine)
+                else:
+                    subtask_id = subtask_ids[(offset + index) % len(subtask_ids)]
+                    _write_submission(engine, subtask_id)
+            except OperationalError:
+                with lock:
+                    locked[kind] += 1
+                continue
+            elapsed = time.perf_counter() - started
+            with lock:
+                (reads if kind == "reads" else writes).append(elapsed)
+
+    threads = [
+        threading.Thread(target=worker, args=("reads", index))
+        for index in range(args.readers)
+    ] + [
+        threading.Thread(target=worker, args=("writes", index))
+        for index in range(args.writers)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    return {
+        "reads": summarize_latencies(reads, elapsed),
+        "writes": summarize_latencies(writes, elapsed),
+        "locked_errors": locked,
+    }
+
+
+def run(args: argparse.Namespace) -> dict:
+    root = configure_environment(args.workdir)
+
+    from app.core.db import SQLITE_PROFILES
+
+    profiles = args.profiles or list(SQLITE_PROFILES)
+    return {
+        "benchmark": "sqlite_profiles",
+        "parameters": vars(args),
+        "results": {profile: _run_profile(profile, root, args) for profile in profiles},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=6, help="Concurrent board readers.")
+    parser.add_argument("--writers", type=int, default=2, help="Concurrent writers.")
+    parser.add_argument(
+        "--operations", type=int, default=200, help="Operations per thread."
+    )
+    parser.add_argument("--users", type=int, default=4, help="Family members to seed.")
+    parser.add_argument(
+        "--profile",
+        dest="profiles",
+        action="append",
+        help="Profile to run (repeatable). Defaults to every profile.",
+    )
+    parser.add_argument(
+        "--workdir",
+        help="Directory for the scratch databases. Use a path on the target "
+        "storage (e.g. the SD card) for representative fsync costs.",
+    )
+    parser.add_argument("--output", help="Write the JSON results to this path.")
+    args = parser.parse_args(argv)
+    write_results(args.output, run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Shared pytest configuration and fixtures.
+
+Settings are read when ``app.core.config`` is first imported, so the scratch
+database and upload directories are configured here before any test module
+imports the application. The fixtures import application code lazily for the
+same reason.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import pkgutil
+import tempfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel
+
+_SCRATCH_ROOT = Path(tempfile.mkdtemp(prefix="fp-tests-"))
+
+os.environ.setdefault("FP_DB_URL", f"sqlite:///{_SCRATCH_ROOT / 'portal.db'}")
+os.environ.setdefault("FP_UPLOADS_DIR", str(_SCRATCH_ROOT / "uploads"))
+os.environ.setdefault("FP_THUMBS_DIR", str(_SCRATCH_ROOT / "uploads" / "thumbs"))
+
+SAMPLE_PLAN = Path(__file__).parent / "fixtures" / "sample_plan.md"
+
+
+@pytest.fixture
+def session() -> Iterator[Session]:
+    """Yield a session on a fresh in-memory database with every app table."""
+
+    import app.models
+
+    for module_info in pkgutil.walk_packages(app.models.__path__, "app.models."):
+        importlib.import_module(module_info.name)
+
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db_session:
+        yield db_session
+    engine.dispose()
+
+
+@pytest.fixture
+def import_plan(session: Session) -> Callable[[], int]:
+    """Return a helper importing the sample plan for a new user into ``session``."""
+
+    from app.core.markdown_import import import_markdown_plan
+    from app.models.users import User
+
+    def _import() -> int:
+        user = User(display_name="Alex")
+        session.add(user)
+        session.flush()
+        return import_markdown_plan(
+            SAMPLE_PLAN.read_text(encoding="utf-8"), user.id, session
+        )
+
+    return _import
@@ -0,0 +1,80 @@
+"""Tests for the board's windowed plan selection and member cards."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.api.public import _board_current_plans, _build_board_user_cards
+from app.core.progress_counters import record_status_change
+from app.models.plans import Plan, PlanStatus
+from app.models.tasks import SubtaskStatus
+from app.models.users import User
+
+
+def _add_plans(session: Session, user_id: int, statuses: list[PlanStatus]) -> list[Plan]:
+    started = datetime(2024, 1, 1)
+    plans = [
+        Plan(
+            title=f"Plan {index}",
+            assignee_user_id=user_id,
+            status=status,
+            created_at=started + timedelta(days=index),
+            updated_at=started + timedelta(days=index),
+        )
+        for index, status in enumerate(statuses)
+    ]
+    session.add_all(plans)
+    session.flush()
+    return plans
+
+
+def test_board_prefers_latest_active_plan_then_latest_unarchived(session):
+    active_user, finished_user, archived_user = (
+        User(display_name="Active"),
+        User(display_name="Finished"),
+        User(display_name="Archived"),
+    )
+    session.add_all([active_user, finished_user, archived_user])
+    session.flush()
+
+    active = _add_plans(
+        session,
+        active_user.id,
+        [PlanStatus.IN_PROGRESS, PlanStatus.IN_PROGRESS, PlanStatus.COMPLETE],
+    )
+    finished = _add_plans(
+        session,
+        finished_user.id,
+        [PlanStatus.COMPLETE, PlanStatus.COMPLETE, PlanStatus.ARCHIVED],
+    )
+    _add_plans(session, archived_user.id, [PlanStatus.ARCHIVED])
+
+    current = _board_current_plans(session)
+
+    assert current[active_user.id].id == active[1].id
+    assert current[finished_user.id].id == finished[1].id
+    assert archived_user.id not in current
+
+
+def test_card_versions_change_only_for_the_member_whose_plan_moved(session, import_plan):
+    changed_plan = session.get(Plan, import_plan())
+    other_plan = session.get(Plan, import_plan())
+    for plan in (changed_plan, other_plan):
+        plan.status = PlanStatus.IN_PROGRESS
+    session.commit()
+
+    def versions() -> dict[int, tuple]:
+        cards = _build_board_user_cards(session)["users"]
+        return {card["id"]: card["version"] for card in cards}
+
+    before = versions()
+    subtask = changed_plan.days[0].subtasks[0]
+    subtask.status = SubtaskStatus.APPROVED
+    record_status_change(session, subtask, SubtaskStatus.PENDING)
+    session.commit()
+    after = versions()
+
+    assert after[changed_plan.assignee_user_id] != before[changed_plan.assignee_user_id]
+    assert after[other_plan.assignee_user_id] == before[other_plan.assignee_user_id]
@@ -0,0 +1,67 @@
+"""Tests for the SQLite connection profiles."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import (
+    async_db_url,
+    build_async_engine,
+    build_engine,
+    sqlite_pragmas,
+)
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_wal_profile_applies_pragmas_on_connect(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'wal.db'}", sqlite_profile="wal")
+
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "temp_store") == 2  # MEMORY
+    assert _pragma(engine, "busy_timeout") > 0
+    assert _pragma(engine, "cache_size") < 0
+
+
+def test_legacy_profile_keeps_driver_defaults(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'legacy.db'}", sqlite_profile="legacy")
+
+    assert _pragma(engine, "journal_mode") == "delete"
+    assert _pragma(engine, "synchronous") == 2  # FULL
+
+
+def test_size_overrides_are_converted_to_sqlite_units():
+    pragmas = sqlite_pragmas(
+        "wal-durable", busy_timeout_ms=250, cache_size_kib=4096, mmap_size_mb=2
+    )
+
+    assert pragmas["synchronous"] == "FULL"
+    assert pragmas["busy_timeout"] == "250"
+    assert pragmas["cache_size"] == "-4096"
+    assert pragmas["mmap_size"] == str(2 * 1024 * 1024)
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        sqlite_pragmas("turbo")
+
+
+def test_async_url_switches_sqlite_to_aiosqlite():
+    assert async_db_url("sqlite:///./portal.db") == "sqlite+aiosqlite:///./portal.db"
+    assert async_db_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+@pytest.mark.asyncio
+async def test_async_engine_applies_profile(tmp_path):
+    engine = build_async_engine(f"sqlite:///{tmp_path / 'async.db'}", sqlite_profile="wal")
+    try:
+        async with engine.connect() as connection:
+            result = await connection.execute(text("PRAGMA journal_mode"))
+            assert result.scalar() == "wal"
+    finally:
+        await engine.dispose()
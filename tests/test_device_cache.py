@@ -0,0 +1,104 @@
+"""Tests for the in-process device identity cache."""
+
+from __future__ import annotations
+
+from app.core.device import materialize_device, revalidate_device
+from app.core.device_cache import DeviceIdentityCache, DeviceSnapshot, device_cache
+from app.models.devices import Device
+from app.models.users import User
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_counts_hits_and_misses():
+    cache = DeviceIdentityCache(max_entries=4, ttl_seconds=60, clock=FakeClock())
+    snapshot = DeviceSnapshot(id="dev-1", friendly_name="Kitchen", linked_user_id=3)
+
+    assert cache.get("dev-1") is None
+    cache.put(snapshot)
+    assert cache.get("dev-1") == snapshot
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_cache_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = DeviceIdentityCache(max_entries=4, ttl_seconds=60, clock=clock)
+    cache.put(DeviceSnapshot(id="dev-1"))
+
+    clock.now = 59
+    assert cache.get("dev-1") is not None
+
+    clock.now = 61
+    assert cache.get("dev-1") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = DeviceIdentityCache(max_entries=2, ttl_seconds=60, clock=FakeClock())
+    cache.put(DeviceSnapshot(id="dev-1"))
+    cache.put(DeviceSnapshot(id="dev-2"))
+    cache.get("dev-1")
+    cache.put(DeviceSnapshot(id="dev-3"))
+
+    assert cache.get("dev-2") is None
+    assert cache.get("dev-1") is not None
+    assert cache.get("dev-3") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_forces_reload():
+    cache = DeviceIdentityCache(max_entries=2, ttl_seconds=60, clock=FakeClock())
+    cache.put(DeviceSnapshot(id="dev-1", linked_user_id=1))
+
+    cache.invalidate("dev-1")
+
+    assert cache.get("dev-1") is None
+
+
+def test_materialized_device_is_cached_only_after_commit(session):
+    device_cache.clear()
+    materialize_device(session, DeviceSnapshot(id="dev-new", persisted=False))
+    assert device_cache.peek("dev-new") is None
+
+    session.commit()
+
+    cached = device_cache.peek("dev-new")
+    assert cached is not None and cached.persisted
+
+
+def test_rolled_back_device_is_not_cached(session):
+    device_cache.clear()
+    materialize_device(session, DeviceSnapshot(id="dev-new", persisted=False))
+    session.rollback()
+    session.commit()
+
+    assert device_cache.peek("dev-new") is None
+
+
+def test_revalidate_device_picks_up_relink_from_another_worker(session):
+    device_cache.clear()
+    user = User(display_name="Alex")
+    session.add(user)
+    session.flush()
+    session.add(Device(id="dev-1", linked_user_id=user.id, token_version=1))
+    session.commit()
+    # Snapshot built from a claims token issued before the relink.
+    stale = DeviceSnapshot(id="dev-1", linked_user_id=None, token_version=0)
+
+    fresh = revalidate_device(session, stale)
+
+    assert fresh.linked_user_id == user.id
+    assert fresh.token_version == 1
+    assert device_cache.peek("dev-1") == DeviceSnapshot.from_device(
+        session.get(Device, "dev-1")
+    )
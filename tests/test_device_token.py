@@ -0,0 +1,61 @@
+"""Tests for device cookie signing and claims tokens."""
+
+from __future__ import annotations
+
+from app.core.device_token import (
+    DeviceClaims,
+    sign_device_claims,
+    sign_device_id,
+    unsign_device_claims,
+    unsign_device_id,
+)
+
+
+def test_signed_device_id_round_trips():
+    cookie = sign_device_id("5b0c8a4e-1f0d-4d4c-9c39-2a9c1f7f1c11")
+
+    assert unsign_device_id(cookie) == "5b0c8a4e-1f0d-4d4c-9c39-2a9c1f7f1c11"
+
+
+def test_tampered_device_id_is_rejected():
+    cookie = sign_device_id("device-a")
+    _, _, signature = cookie.rpartition(".")
+
+    assert unsign_device_id(f"device-b.{signature}") is None
+
+
+def test_unsigned_value_is_rejected():
+    assert unsign_device_id("5b0c8a4e-1f0d-4d4c-9c39-2a9c1f7f1c11") is None
+    assert unsign_device_id(".abc") is None
+
+
+def test_signed_claims_round_trip():
+    claims = DeviceClaims(
+        device_id="device-a", linked_user_id=7, version=3, issued_at=1_700_000_000
+    )
+
+    assert unsign_device_claims(sign_device_claims(claims)) == claims
+
+
+def test_claims_without_linked_user_round_trip():
+    claims = DeviceClaims(device_id="device-a", linked_user_id=None, version=1, issued_at=5)
+
+    assert unsign_device_claims(sign_device_claims(claims)) == claims
+
+
+def test_tampered_claims_are_rejected():
+    token = sign_device_claims(
+        DeviceClaims(device_id="device-a", linked_user_id=7, version=3, issued_at=5)
+    )
+    forged = token.replace(".7.", ".8.", 1)
+
+    assert unsign_device_claims(forged) is None
+
+
+def test_token_formats_are_not_interchangeable():
+    claims_token = sign_device_claims(
+        DeviceClaims(device_id="device-a", linked_user_id=None, version=1, issued_at=5)
+    )
+
+    assert unsign_device_id(claims_token) is None
+    assert unsign_device_claims(sign_device_id("device-a")) is None
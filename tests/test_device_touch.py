@@ -0,0 +1,89 @@
+"""Tests for the buffered device ``last_seen_at`` writer."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlmodel import SQLModel
+
+from app.core.device_touch import DeviceTouchBuffer
+from app.models.devices import Device
+from app.models.users import User
+
+
+def _make_engine():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[User.__table__, Device.__table__])
+    return engine
+
+
+def _insert_device(engine, device_id: str, last_seen_at: datetime | None) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            Device.__table__.insert().values(
+                id=device_id, created_at=datetime.utcnow(), last_seen_at=last_seen_at
+            )
+        )
+
+
+def _last_seen(engine, device_id: str) -> datetime | None:
+    table = Device.__table__
+    with engine.connect() as connection:
+        return connection.execute(
+            select(table.c.last_seen_at).where(table.c.id == device_id)
+        ).scalar_one()
+
+
+def test_touch_keeps_latest_timestamp_per_device():
+    buffer = DeviceTouchBuffer(flush_interval=30)
+    earlier = datetime(2024, 1, 1, 8, 0, 0)
+    later = earlier + timedelta(minutes=5)
+
+    buffer.touch("dev-1", later)
+    buffer.touch("dev-1", earlier)
+    buffer.touch("dev-2", earlier)
+
+    assert len(buffer) == 2
+    assert buffer.drain() == {"dev-1": later, "dev-2": earlier}
+    assert len(buffer) == 0
+
+
+def test_flush_writes_pending_sightings_in_one_batch():
+    engine = _make_engine()
+    stale = datetime(2024, 1, 1, 8, 0, 0)
+    _insert_device(engine, "dev-1", stale)
+    _insert_device(engine, "dev-2", None)
+
+    buffer = DeviceTouchBuffer(flush_interval=30)
+    seen = stale + timedelta(hours=1)
+    buffer.touch("dev-1", seen)
+    buffer.touch("dev-2", seen)
+
+    assert buffer.flush(engine) == 2
+    assert len(buffer) == 0
+    assert _last_seen(engine, "dev-1") == seen
+    assert _last_seen(engine, "dev-2") == seen
+
+
+def test_flush_never_moves_last_seen_backwards():
+    engine = _make_engine()
+    recent = datetime(2024, 1, 2, 8, 0, 0)
+    _insert_device(engine, "dev-1", recent)
+
+    buffer = DeviceTouchBuffer(flush_interval=30)
+    buffer.touch("dev-1", recent - timedelta(days=1))
+    buffer.flush(engine)
+
+    assert _last_seen(engine, "dev-1") == recent
+
+
+def test_flush_requeues_sightings_when_write_fails():
+    engine = create_engine("sqlite://")  # no device table, so the UPDATE fails
+    seen = datetime(2024, 1, 1, 8, 0, 0)
+
+    buffer = DeviceTouchBuffer(flush_interval=30)
+    buffer.touch("dev-1", seen)
+
+    assert buffer.flush(engine) == 0
+    assert buffer.drain() == {"dev-1": seen}
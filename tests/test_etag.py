@@ -0,0 +1,43 @@
+"""Tests for the conditional-request helpers."""
+
+from starlette.requests import Request
+
+from app.core.etag import conditional_headers, etag_matches, make_etag, not_modified
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode("latin-1")))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_make_etag_is_stable_and_quoted():
+    etag = make_etag("board", "plan-summary", 7)
+
+    assert etag == make_etag("board", "plan-summary", 7)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != make_etag("board", "plan-summary", 8)
+    assert etag != make_etag("board", "user-cards", 7)
+
+
+def test_etag_matches_exact_weak_and_lists():
+    etag = make_etag("board", 1)
+
+    assert etag_matches(_request(etag), etag)
+    assert etag_matches(_request(f"W/{etag}"), etag)
+    assert etag_matches(_request(f'"other", {etag}'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('"other"'), etag)
+    assert not etag_matches(_request(), etag)
+
+
+def test_not_modified_carries_validators():
+    etag = make_etag("review-queue", 3)
+    response = not_modified(etag, vary="Cookie")
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["vary"] == "Cookie"
+    assert conditional_headers(etag, vary="Cookie")["Cache-Control"] == "no-cache"
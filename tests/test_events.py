@@ -0,0 +1,147 @@
+"""Tests for the Server-Sent Events broadcaster."""
+
+import asyncio
+import signal
+import threading
+
+import httpx
+import pytest
+import uvicorn
+
+from app.core.device_touch import device_touches
+from app.core.events import RESYNC_EVENT, EventBroadcaster, format_sse
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_publish_reaches_every_subscriber():
+    broadcaster = EventBroadcaster(max_pending=4)
+    first = broadcaster.subscribe()
+    second = broadcaster.subscribe()
+
+    broadcaster.publish_many({"reviewQueueRefresh": True, "planProgressUpdated": {"plan_id": 3}})
+
+    expected = [("reviewQueueRefresh", "{}"), ("planProgressUpdated", '{"plan_id": 3}')]
+    assert await first.next_batch(1) == expected
+    assert await second.next_batch(1) == expected
+
+
+@pytest.mark.asyncio
+async def test_duplicate_events_coalesce():
+    broadcaster = EventBroadcaster(max_pending=4)
+    subscription = broadcaster.subscribe()
+
+    for _ in range(3):
+        broadcaster.publish("planProgressUpdated", {"plan_id": 1})
+    broadcaster.publish("planProgressUpdated", {"plan_id": 2})
+
+    batch = await subscription.next_batch(1)
+    assert [data for _, data in batch] == ['{"plan_id": 1}', '{"plan_id": 2}']
+    assert broadcaster.stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_bounded_and_resynced():
+    broadcaster = EventBroadcaster(max_pending=2)
+    slow = broadcaster.subscribe()
+
+    for plan_id in range(50):
+        broadcaster.publish("planProgressUpdated", {"plan_id": plan_id})
+
+    assert len(slow._pending) <= 2
+    assert await slow.next_batch(1) == [(RESYNC_EVENT, "{}")]
+    assert await slow.next_batch(0.01) == []
+    assert broadcaster.stats()["overflows"] == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_from_worker_thread():
+    broadcaster = EventBroadcaster(max_pending=4)
+    subscription = broadcaster.subscribe()
+
+    worker = threading.Thread(target=broadcaster.publish, args=("reviewQueueRefresh", True))
+    worker.start()
+    worker.join()
+
+    assert await subscription.next_batch(1) == [("reviewQueueRefresh", "{}")]
+
+
+@pytest.mark.asyncio
+async def test_close_ends_subscriptions():
+    broadcaster = EventBroadcaster(max_pending=4)
+    subscription = broadcaster.subscribe()
+
+    waiter = asyncio.create_task(subscription.next_batch(5))
+    await asyncio.sleep(0)
+    broadcaster.close()
+
+    assert await waiter is None
+    assert broadcaster.stats()["clients"] == 0
+
+
+def test_publish_without_subscribers_is_a_noop():
+    broadcaster = EventBroadcaster(max_pending=4)
+    broadcaster.publish("reviewQueueRefresh", True)
+
+    assert broadcaster.stats()["published"] == 0
+    assert format_sse("resync", "{}") == "event: resync\ndata: {}\n\n"
+
+
+@pytest.mark.asyncio
+async def test_origin_tags_every_published_event():
+    broadcaster = EventBroadcaster(max_pending=4)
+    subscription = broadcaster.subscribe()
+
+    broadcaster.publish_many(
+        {"reviewQueueRefresh": True, "planProgressUpdated": {"plan_id": 3}},
+        origin="client-1",
+    )
+
+    assert await subscription.next_batch(1) == [
+        ("reviewQueueRefresh", '{"origin": "client-1"}'),
+        ("planProgressUpdated", '{"origin": "client-1", "plan_id": 3}'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_closed_broadcaster_refuses_new_subscriptions_until_opened():
+    broadcaster = EventBroadcaster(max_pending=4)
+    broadcaster.close_soon()
+
+    assert await broadcaster.subscribe().next_batch(5) is None
+    assert broadcaster.stats()["clients"] == 0
+
+    broadcaster.open()
+    assert broadcaster.subscribe().closed is False
+
+
+@pytest.mark.asyncio
+async def test_sigterm_ends_open_streams_so_shutdown_completes(monkeypatch):
+    flushes = []
+    monkeypatch.setattr(device_touches, "flush", lambda: flushes.append(True))
+    # Uvicorn re-raises the captured signal once it has shut down.
+    previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: None)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+
+        async with httpx.AsyncClient() as client:
+            url = f"http://127.0.0.1:{port}/events"
+            async with client.stream("GET", url) as response:
+                chunks = response.aiter_text()
+                assert (await anext(chunks)).startswith("retry:")
+
+                signal.raise_signal(signal.SIGTERM)
+                await asyncio.wait_for(serving, timeout=5)
+
+                assert [chunk async for chunk in chunks] == []
+    finally:
+        server.should_exit = True
+        signal.signal(signal.SIGTERM, previous_handler)
+
+    assert flushes
@@ -0,0 +1,62 @@
+"""Tests for the rendered fragment cache."""
+
+from jinja2 import DictLoader, Environment
+
+from app.core import fragments
+from app.core.fragments import FragmentCache
+
+
+def test_fragment_is_reused_until_its_version_changes():
+    cache = FragmentCache(max_entries=4)
+    renders: list[str] = []
+
+    def render(text: str):
+        def _render() -> str:
+            renders.append(text)
+            return text
+
+        return _render
+
+    assert cache.get_or_render("card", {"xp": 1}, render("<b>1</b>")) == "<b>1</b>"
+    assert cache.get_or_render("card", {"xp": 1}, render("unused")) == "<b>1</b>"
+    assert cache.get_or_render("card", {"xp": 2}, render("<b>2</b>")) == "<b>2</b>"
+
+    assert renders == ["<b>1</b>", "<b>2</b>"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_least_recently_used_fragment_is_evicted():
+    cache = FragmentCache(max_entries=2)
+    cache.get_or_render("a", 1, lambda: "a")
+    cache.get_or_render("b", 1, lambda: "b")
+    cache.get_or_render("a", 1, lambda: "unused")
+    cache.get_or_render("c", 1, lambda: "c")
+
+    assert cache.get_or_render("a", 1, lambda: "unused") == "a"
+    assert cache.get_or_render("b", 1, lambda: "b again") == "b again"
+    assert cache.stats()["evictions"] == 2
+
+
+def test_render_fragment_template_global(monkeypatch):
+    monkeypatch.setattr(fragments, "fragment_cache", FragmentCache(max_entries=8))
+    environment = Environment(
+        autoescape=True,
+        loader=DictLoader(
+            {
+                "list.html": (
+                    "{% for member in members %}"
+                    '{{ render_fragment("card.html", member.id, member, member=member) }}'
+                    "{% endfor %}"
+                ),
+                "card.html": "<p>{{ member.name }}</p>",
+            }
+        ),
+    )
+    environment.globals["render_fragment"] = fragments.render_fragment
+    template = environment.get_template("list.html")
+    members = [{"id": 1, "name": "Alex & Bo"}, {"id": 2, "name": "Cam"}]
+
+    assert template.render(members=members) == "<p>Alex &amp; Bo</p><p>Cam</p>"
+    members[1] = {"id": 2, "name": "Dee"}
+    assert template.render(members=members) == "<p>Alex &amp; Bo</p><p>Dee</p>"
+    assert fragments.fragment_cache.stats()["hits"] == 1
@@ -0,0 +1,83 @@
+"""Tests for the data-generation counter and the cache keyed by it."""
+
+from __future__ import annotations
+
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel
+
+from app.core.generation import (
+    GenerationCache,
+    current_generation,
+    track_data_generation,
+)
+from app.models.generation import DataGeneration
+from app.models.users import User
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    track_data_generation(engine)
+    SQLModel.metadata.create_all(
+        engine, tables=[User.__table__, DataGeneration.__table__]
+    )
+    return engine
+
+
+def test_writes_bump_the_generation_but_reads_do_not():
+    engine = _engine()
+
+    with Session(engine) as session:
+        assert current_generation(session) == 0
+        user = User(display_name="Alex")
+        session.add(user)
+        session.commit()
+        assert current_generation(session) == 1
+
+        session.get(User, user.id)
+        session.flush()
+        assert current_generation(session) == 1
+
+        user.display_name = "Alexandra"
+        session.commit()
+        assert current_generation(session) == 2
+
+
+def test_rolled_back_writes_do_not_bump_the_generation():
+    engine = _engine()
+
+    with Session(engine) as session:
+        session.add(User(display_name="Alex"))
+        session.flush()
+        session.rollback()
+
+        assert current_generation(session) == 0
+
+
+def test_cache_rebuilds_only_after_a_write():
+    engine = _engine()
+    cache = GenerationCache()
+    builds = []
+
+    def build(session: Session) -> int:
+        builds.append(1)
+        return len(builds)
+
+    with Session(engine) as session:
+        assert cache.get_or_build(session, "board", build) == 1
+        assert cache.get_or_build(session, "board", build) == 1
+
+        session.add(User(display_name="Bo"))
+        session.commit()
+
+        assert cache.get_or_build(session, "board", build) == 2
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+
+def test_untracked_engines_need_no_generation_table():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[User.__table__])
+
+    with Session(engine) as session:
+        session.add(User(display_name="Alex"))
+        session.commit()
@@ -1,8 +1,9 @@
 from datetime import datetime, timedelta
 
-from app.core.locking import refresh_plan_day_locks
+from app.core.locking import find_lock_drift, refresh_plan_day_locks, repair_plan_locks
 from app.models.plans import Plan, PlanStatus
 from app.models.tasks import PlanDay, Subtask, SubtaskStatus
+from app.models.users import User
 
 
 def _make_plan_day(plan_id: int, day_index: int, locked: bool, statuses: list[SubtaskStatus]) -> PlanDay:
@@ -93,3 +94,35 @@ def test_refresh_plan_day_locks_reverts_complete_if_subtask_denied():
     assert changed is True
     assert [day.locked for day in plan.days] == [False, True]
     assert plan.status == PlanStatus.IN_PROGRESS
+
+
+def test_repair_plan_locks_fixes_only_drifted_plans(session):
+    user = User(display_name="Alex")
+    session.add(user)
+    session.flush()
+
+    plans = {}
+    for title, first_status, plan_status in (
+        ("Consistent", SubtaskStatus.PENDING, PlanStatus.IN_PROGRESS),
+        ("Drifted", SubtaskStatus.APPROVED, PlanStatus.IN_PROGRESS),
+        ("Archived", SubtaskStatus.APPROVED, PlanStatus.ARCHIVED),
+    ):
+        plan = Plan(title=title, assignee_user_id=user.id, status=plan_status)
+        for day_index, status in enumerate((first_status, SubtaskStatus.PENDING)):
+            day = PlanDay(day_index=day_index, title="Day", locked=day_index > 0)
+            day.subtasks.append(Subtask(order_index=0, text="Task", status=status))
+            plan.days.append(day)
+        session.add(plan)
+        plans[title] = plan
+    session.commit()
+
+    assert find_lock_drift(session) == [plans["Drifted"].id]
+    assert not session.dirty
+    assert repair_plan_locks(session) == [plans["Drifted"].id]
+    session.commit()
+
+    assert [day.locked for day in plans["Drifted"].days] == [False, False]
+    assert [day.locked for day in plans["Archived"].days] == [False, True]
+    assert plans["Archived"].status == PlanStatus.ARCHIVED
+    assert find_lock_drift(session) == []
+    assert repair_plan_locks(session) == []
@@ -79,6 +79,8 @@ class StubPlanDay:
     title: str
     locked: bool
     id: int | None = None
+    approved_count: int = 0
+    total_count: int = 0
     subtasks: list[StubSubtask] = field(default_factory=list)
 
 
@@ -89,6 +91,10 @@ class StubPlan:
     status: PlanStatus
     id: int | None = None
     total_xp: int = 0
+    approved_count: int = 0
+    total_count: int = 0
+    completed_day_count: int = 0
+    day_count: int = 0
     days: list[StubPlanDay] = field(default_factory=list)
 
 
@@ -144,9 +150,11 @@ def test_import_markdown_plan_creates_full_hierarchy(monkeypatch):
     assert plan.assignee_user_id == 99
     assert plan.status == PlanStatus.IN_PROGRESS
     assert plan.total_xp == 75
+    assert (plan.total_count, plan.day_count, plan.completed_day_count) == (5, 3, 0)
 
     assert [day.day_index for day in plan.days] == [0, 1, 2]
     assert [day.locked for day in plan.days] == [False, True, True]
+    assert [day.total_count for day in plan.days] == [2, 2, 1]
     assert [day.title for day in plan.days] == [
         "Arrival",
         "Exploration",
@@ -0,0 +1,120 @@
+"""Tests for the plan page's progress, per-subtask and submission history data paths."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session
+
+from app.api.public import (
+    _build_plan_context,
+    SUBMISSION_PAGE_SIZE,
+    _load_plan_progress_context,
+    _load_submission_page_context,
+    _load_subtask_updates_context,
+    _plan_days_etag,
+    _plan_progress_etag,
+)
+from app.core.progress_counters import record_status_change
+from app.models.devices import Device
+from app.models.plans import Plan
+from app.models.tasks import Subtask, SubtaskStatus, SubtaskSubmission
+
+
+def _approve(session: Session, subtask: Subtask) -> None:
+    previous_status = subtask.status
+    subtask.status = SubtaskStatus.APPROVED
+    record_status_change(session, subtask, previous_status)
+    session.flush()
+
+
+def test_progress_context_matches_full_plan_context(session, import_plan):
+    plan_id = import_plan()
+    plan = session.get(Plan, plan_id)
+    subtask = plan.days[0].subtasks[0]
+    _approve(session, subtask)
+    plan.total_xp = subtask.xp_value
+    session.flush()
+
+    full = _build_plan_context(plan)
+    progress = _load_plan_progress_context(session, plan_id)
+
+    assert progress == {"total_xp": full["total_xp"], "progress": full["progress"]}
+    assert progress["progress"]["approved_subtasks"] == 1
+
+
+def test_subtask_updates_context_covers_row_day_header_and_progress(session, import_plan):
+    plan_id = import_plan()
+    other_plan_id = import_plan()
+    plan = session.get(Plan, plan_id)
+    subtask = plan.days[0].subtasks[0]
+    _approve(session, subtask)
+
+    context = _load_subtask_updates_context(session, plan_id, subtask.id)
+
+    assert context["subtask"]["id"] == subtask.id
+    assert context["subtask"]["status"] == SubtaskStatus.APPROVED.value
+    assert context["day"]["id"] == plan.days[0].id
+    assert context["day"]["completed_subtasks"] == 1
+    assert context["plan"]["progress"]["approved_subtasks"] == 1
+
+    with pytest.raises(HTTPException):
+        _load_subtask_updates_context(session, other_plan_id, subtask.id)
+
+
+def test_submission_history_shows_latest_and_pages_older_by_keyset(session, import_plan):
+    plan_id = import_plan()
+    subtask = session.get(Plan, plan_id).days[0].subtasks[0]
+    device = Device(id="device-1")
+    session.add(device)
+    started = datetime(2024, 1, 1)
+    # Two submissions share each timestamp; ids break the tie.
+    submissions = [
+        SubtaskSubmission(
+            subtask_id=subtask.id,
+            submitted_by_device_id=device.id,
+            comment=f"Attempt {index}",
+            created_at=started + timedelta(hours=index // 2),
+        )
+        for index in range(SUBMISSION_PAGE_SIZE * 2 + 1)
+    ]
+    session.add_all(submissions)
+    session.flush()
+    newest_first = [submission.id for submission in reversed(submissions)]
+
+    row = _load_subtask_updates_context(session, plan_id, subtask.id)["subtask"]
+    assert row["latest_submission"]["id"] == newest_first[0]
+    assert row["older_submission_count"] == len(submissions) - 1
+
+    seen: list[int] = []
+    url = row["older_submissions_url"]
+    while url:
+        before = int(url.rsplit("before=", 1)[1])
+        page = _load_submission_page_context(session, plan_id, subtask.id, before)
+        assert len(page["submissions"]) <= SUBMISSION_PAGE_SIZE
+        seen.extend(item["id"] for item in page["submissions"])
+        url = page["next_url"]
+
+    assert seen == newest_first[1:]
+
+
+def test_plan_etags_ignore_writes_to_other_plans(session, import_plan):
+    plan_id = import_plan()
+    days_etag = _plan_days_etag(session, plan_id)
+    progress_etag = _plan_progress_etag(session, plan_id)
+
+    other_plan = session.get(Plan, import_plan())
+    _approve(session, other_plan.days[0].subtasks[0])
+
+    assert _plan_days_etag(session, plan_id) == days_etag
+    assert _plan_progress_etag(session, plan_id) == progress_etag
+
+    _approve(session, session.get(Plan, plan_id).days[0].subtasks[0])
+
+    assert _plan_days_etag(session, plan_id) != days_etag
+    assert _plan_progress_etag(session, plan_id) != progress_etag
+
+    with pytest.raises(HTTPException):
+        _plan_days_etag(session, plan_id + 100)
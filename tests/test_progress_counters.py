@@ -0,0 +1,79 @@
+"""Tests for the denormalized plan and day progress counters."""
+
+from __future__ import annotations
+
+from sqlmodel import Session, select
+
+from app.core.progress_counters import (
+    day_progress_from_counters,
+    find_progress_drift,
+    plan_progress_from_counters,
+    recount_progress,
+    record_status_change,
+)
+from app.core.progress_queries import day_progress_by_day, plan_progress_by_plan
+from app.models.plans import Plan
+from app.models.tasks import PlanDay, Subtask, SubtaskStatus
+
+
+def _set_status(session: Session, subtask: Subtask, status: SubtaskStatus) -> None:
+    previous_status = subtask.status
+    subtask.status = status
+    record_status_change(session, subtask, previous_status)
+
+
+def _assert_counters_match(session: Session, plan_id: int) -> None:
+    plan = session.get(Plan, plan_id)
+    assert plan_progress_from_counters(plan) == plan_progress_by_plan(session)[plan_id]
+    actual_days = day_progress_by_day(session)
+    for day in plan.days:
+        assert day_progress_from_counters(day) == actual_days[day.id]
+
+
+def test_import_initialises_counters(session, import_plan):
+    plan_id = import_plan()
+
+    _assert_counters_match(session, plan_id)
+    assert find_progress_drift(session) == []
+
+
+def test_status_transitions_update_counters(session, import_plan):
+    plan_id = import_plan()
+    first_day = session.exec(
+        select(PlanDay).where(PlanDay.plan_id == plan_id).order_by(PlanDay.day_index)
+    ).first()
+
+    for subtask in first_day.subtasks:
+        _set_status(session, subtask, SubtaskStatus.SUBMITTED)
+        _set_status(session, subtask, SubtaskStatus.APPROVED)
+    session.commit()
+
+    assert first_day.approved_count == first_day.total_count
+    plan = session.get(Plan, plan_id)
+    assert plan.completed_day_count == 1
+    _assert_counters_match(session, plan_id)
+
+    _set_status(session, first_day.subtasks[0], SubtaskStatus.DENIED)
+    session.commit()
+
+    assert plan.completed_day_count == 0
+    _assert_counters_match(session, plan_id)
+
+
+def test_drift_is_detected_and_repaired(session, import_plan):
+    plan_id = import_plan()
+    subtask = session.exec(select(Subtask)).first()
+    subtask.status = SubtaskStatus.APPROVED  # bypasses record_status_change
+    session.commit()
+
+    drift = find_progress_drift(session)
+    assert {(entry.entity_type, entry.entity_id) for entry in drift} == {
+        ("plan_day", subtask.plan_day_id),
+        ("plan", plan_id),
+    }
+
+    recount_progress(session)
+    session.commit()
+
+    assert find_progress_drift(session) == []
+    _assert_counters_match(session, plan_id)
@@ -0,0 +1,71 @@
+"""Tests for the SQL progress aggregates used by the board."""
+
+from __future__ import annotations
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from app.core.locking import ProgressCache
+from app.core.progress_queries import day_progress_by_day, plan_progress_by_plan
+from app.models.plans import Plan
+from app.models.tasks import PlanDay, Subtask, SubtaskStatus
+from app.models.users import User
+
+APPROVED = SubtaskStatus.APPROVED
+PENDING = SubtaskStatus.PENDING
+
+
+def _add_plan(session: Session, assignee_id: int, days: list[list[SubtaskStatus]]) -> int:
+    plan = Plan(title="Plan", assignee_user_id=assignee_id)
+    session.add(plan)
+    session.flush()
+    for day_index, statuses in enumerate(days):
+        day = PlanDay(plan_id=plan.id, day_index=day_index, title=f"Day {day_index + 1}")
+        session.add(day)
+        session.flush()
+        for order_index, status in enumerate(statuses):
+            session.add(
+                Subtask(
+                    plan_day_id=day.id, order_index=order_index, text="Task", status=status
+                )
+            )
+    session.flush()
+    return plan.id
+
+
+def test_aggregates_match_in_memory_progress(session):
+    user = User(display_name="Alex")
+    session.add(user)
+    session.flush()
+    plan_ids = [
+        _add_plan(session, user.id, [[APPROVED, APPROVED], [APPROVED, PENDING], []]),
+        _add_plan(session, user.id, [[PENDING], [SubtaskStatus.DENIED]]),
+        _add_plan(session, user.id, []),
+    ]
+    session.commit()
+
+    aggregated = plan_progress_by_plan(session)
+    days = day_progress_by_day(session)
+    plans = session.exec(
+        select(Plan).options(selectinload(Plan.days).selectinload(PlanDay.subtasks))
+    ).all()
+
+    cache = ProgressCache()
+    for plan in plans:
+        assert aggregated[plan.id] == cache.plan_progress(plan)
+        for day in plan.days:
+            assert days[day.id] == cache.day_progress(day)
+
+    assert aggregated[plan_ids[0]].completed_days == 2
+    assert aggregated[plan_ids[2]].total_days == 0
+
+
+def test_aggregates_can_be_limited_to_plans(session):
+    user = User(display_name="Alex")
+    session.add(user)
+    session.flush()
+    first = _add_plan(session, user.id, [[APPROVED]])
+    _add_plan(session, user.id, [[PENDING]])
+    session.commit()
+
+    assert set(plan_progress_by_plan(session, plan_ids=[first])) == {first}
@@ -0,0 +1,216 @@
+"""Guard HTML and HTMX endpoints against N+1 query regressions.
+
+Each endpoint is rendered against a small and a larger seeded dataset. The
+number of SQL statements must not depend on the number of rows: a lazy load
+inside a loop (``entry.device`` in the activity log, the uploader of an
+attachment on the review page, ...) makes the larger dataset issue more
+statements and fails the test.
+"""
+
+from __future__ import annotations
+
+import importlib
+import pkgutil
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel
+
+import app.models
+from app.core.config import settings
+from app.core.db import engine
+from app.core.device_cache import device_cache
+from app.core.generation import context_cache
+from app.core.markdown_import import import_markdown_plan
+from app.core.xp_summary import rebuild_xp_summaries
+from app.main import app as portal_app
+from app.models.activity import ActivityLog
+from app.models.attachments import Attachment
+from app.models.devices import Device
+from app.models.plans import Plan
+from app.models.tasks import SubtaskStatus, SubtaskSubmission
+from app.models.users import User, UserRole
+from app.models.xp import XPEvent
+
+SAMPLE_PLAN = Path(__file__).parent / "fixtures" / "sample_plan.md"
+
+ENDPOINTS = [
+    "/",
+    "/?partial=plan-summary",
+    "/?partial=user-cards",
+    "/plan/{plan_id}",
+    "/plan/{plan_id}/partials/days",
+    "/plan/{plan_id}/partials/days/{day_id}",
+    "/plan/{plan_id}/partials/subtasks/{subtask_id}",
+    "/plan/{plan_id}/partials/progress",
+    "/review",
+    "/review/partials/queue",
+    "/admin/activity",
+    "/admin/devices",
+]
+
+SMALL_SCALE = 1
+LARGE_SCALE = 4
+
+# Generation, subtasks, their day, plan and assignee, the latest submissions
+# with their submitting user and device (plus its linked user), and the
+# requesting device.
+REVIEW_QUEUE_QUERY_BUDGET = 10
+
+
+def _reset_schema() -> None:
+    for module_info in pkgutil.walk_packages(app.models.__path__, "app.models."):
+        importlib.import_module(module_info.name)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    device_cache.clear()
+
+
+def seed_dataset(scale: int) -> int:
+    """Populate the database and return the id of the plan under test.
+
+    Every relationship rendered by the endpoints grows with ``scale``:
+    users, devices, plans, submissions, attachments, XP events and activity
+    entries.
+    """
+
+    _reset_schema()
+    markdown = SAMPLE_PLAN.read_text(encoding="utf-8")
+
+    with Session(engine) as session:
+        reviewer = User(display_name="Reviewer", role=UserRole.ADMIN)
+        assignee = User(display_name="Assignee")
+        session.add(reviewer)
+        session.add(assignee)
+        members = [User(display_name=f"Member {index}") for index in range(scale)]
+        session.add_all(members)
+        session.flush()
+        people = [assignee, *members]
+
+        devices = [
+            Device(id=f"device-{index}", linked_user_id=people[index % len(people)].id)
+            for index in range(scale)
+        ]
+        session.add_all(devices)
+        session.flush()
+
+        plan_id = import_markdown_plan(markdown, assignee.id, session)
+        for person in people:
+            for _ in range(scale):
+                import_markdown_plan(markdown, person.id, session)
+
+        plan = session.get(Plan, plan_id)
+        for day in plan.days:
+            day.locked = False
+            for subtask in day.subtasks:
+                subtask.status = SubtaskStatus.SUBMITTED
+                for index in range(scale):
+                    device = devices[index % len(devices)]
+                    session.add(
+                        SubtaskSubmission(
+                            subtask_id=subtask.id,
+                            submitted_by_device_id=device.id,
+                            submitted_by_user_id=device.linked_user_id,
+                            photo_path=f"uploads/{subtask.id}-{index}.jpg",
+                            comment=f"Attempt {index}",
+                        )
+                    )
+                    session.add(
+                        Attachment(
+                            subtask_id=subtask.id,
+                            file_path=f"uploads/{subtask.id}-{index}.jpg",
+                            thumb_path=f"uploads/thumbs/{subtask.id}-{index}.jpg",
+                            uploaded_by_device_id=device.id,
+                            uploaded_by_user_id=device.linked_user_id,
+                        )
+                    )
+        for index, device in enumerate(devices):
+            session.add(
+                Attachment(
+                    plan_id=plan_id,
+                    file_path=f"uploads/plan-{index}.jpg",
+                    thumb_path=f"uploads/thumbs/plan-{index}.jpg",
+                    uploaded_by_device_id=device.id,
+                    uploaded_by_user_id=device.linked_user_id,
+                )
+            )
+
+        for person in people:
+            for index in range(scale):
+                session.add(XPEvent(user_id=person.id, delta=10, reason="subtask.approved"))
+        for index in range(scale * 5):
+            device = devices[index % len(devices)]
+            session.add(
+                ActivityLog(
+                    action="subtask.submitted",
+                    entity_type="subtask",
+                    entity_id=index + 1,
+                    device_id=device.id,
+                    user_id=device.linked_user_id,
+                )
+            )
+
+        session.flush()
+        rebuild_xp_summaries(session)
+        session.commit()
+
+    return plan_id
+
+
+@pytest.fixture
+def count_queries(monkeypatch) -> Callable[[TestClient, str], int]:
+    """Return a helper reporting the statements issued by one GET request.
+
+    The URL is requested twice and the second request is measured, so
+    one-off work such as device resolution or lock refreshes is excluded.
+    Cached contexts are dropped in between so the builders always run.
+    """
+
+    monkeypatch.setattr(settings, "query_debug_headers", True)
+
+    def _count(client: TestClient, url: str) -> int:
+        client.get(url, headers={"HX-Request": "true"})
+        context_cache.clear()
+        response = client.get(url, headers={"HX-Request": "true"})
+        assert response.status_code == 200, response.text
+        return int(response.headers["X-DB-Query-Count"])
+
+    return _count
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_query_count_does_not_grow_with_dataset(endpoint, count_queries):
+    counts = {}
+    for scale in (SMALL_SCALE, LARGE_SCALE):
+        plan_id = seed_dataset(scale)
+        with Session(engine) as session:
+            day = session.get(Plan, plan_id).days[0]
+            day_id, subtask_id = day.id, day.subtasks[0].id
+        url = endpoint.format(plan_id=plan_id, day_id=day_id, subtask_id=subtask_id)
+        with TestClient(portal_app) as client:
+            counts[scale] = count_queries(client, url)
+
+    assert counts[LARGE_SCALE] == counts[SMALL_SCALE], (
+        f"{endpoint} issued {counts[SMALL_SCALE]} statements at scale "
+        f"{SMALL_SCALE} but {counts[LARGE_SCALE]} at scale {LARGE_SCALE}"
+    )
+
+
+
+def test_review_queue_stays_within_query_budget(count_queries):
+    """The queue reads progress from counters and only the latest submission.
+
+    Loading ``Plan.days -> subtasks`` or every submission again would add
+    statements here even though the count stays flat across scales.
+    """
+
+    seed_dataset(LARGE_SCALE)
+    with TestClient(portal_app) as client:
+        count = count_queries(client, "/review/partials/queue")
+
+    assert count <= REVIEW_QUEUE_QUERY_BUDGET, (
+        f"/review/partials/queue issued {count} statements; "
+        f"budget is {REVIEW_QUEUE_QUERY_BUDGET}"
+    )
@@ -0,0 +1,59 @@
+"""Tests for per-request SQL statement instrumentation."""
+
+from __future__ import annotations
+
+from sqlalchemy import create_engine, text
+
+from app.core.query_stats import (
+    QueryMetrics,
+    QueryStats,
+    collect_query_stats,
+    instrument_engine,
+)
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)
+    return engine
+
+
+def test_statements_are_counted_inside_the_collection_scope():
+    engine = _engine()
+
+    with engine.connect() as connection:
+        with collect_query_stats() as stats:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT   2"))
+        connection.execute(text("SELECT 3"))
+
+    assert stats.count == 2
+    assert stats.total_seconds >= stats.slowest_seconds > 0
+    assert stats.slowest_statement in {"SELECT 1", "SELECT 2"}
+
+
+def test_statements_outside_a_request_are_ignored():
+    engine = _engine()
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    with collect_query_stats() as stats:
+        pass
+
+    assert stats.count == 0
+
+
+def test_metrics_aggregate_per_route():
+    metrics = QueryMetrics()
+    metrics.record("GET /", QueryStats(count=4, total_seconds=0.004, slowest_seconds=0.002))
+    metrics.record("GET /", QueryStats(count=6, total_seconds=0.006, slowest_seconds=0.001))
+
+    route = metrics.snapshot()["GET /"]
+
+    assert route["requests"] == 2
+    assert route["avg_statements"] == 5
+    assert route["max_statements"] == 6
+    assert route["avg_db_ms"] == 5.0
+    assert route["slowest_ms"] == 2.0
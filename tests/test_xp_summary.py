@@ -0,0 +1,65 @@
+"""Tests for the materialized per-user XP summaries."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.core.xp_summary import (
+    RECENT_EVENT_LIMIT,
+    rebuild_xp_summaries,
+    record_xp_events,
+    xp_history,
+)
+from app.models.users import User
+from app.models.xp import UserXPSummary, XPEvent
+
+
+def _add_events(session: Session, user_id: int, deltas: list[int]) -> list[XPEvent]:
+    started = datetime(2024, 5, 1, 9, 0, 0)
+    events = [
+        XPEvent(
+            user_id=user_id,
+            delta=delta,
+            reason="subtask.approved",
+            created_at=started + timedelta(minutes=index),
+        )
+        for index, delta in enumerate(deltas)
+    ]
+    session.add_all(events)
+    return events
+
+
+def test_record_xp_events_accumulates_totals_and_recent_history(session):
+    user = User(display_name="Alex")
+    session.add(user)
+    session.flush()
+
+    record_xp_events(session, _add_events(session, user.id, [60, 30]))
+    record_xp_events(session, _add_events(session, user.id, [20, 5, 5, 5, 5]))
+    session.commit()
+
+    summary = session.get(UserXPSummary, user.id)
+    assert summary.total_xp == 130
+    assert summary.level == 1
+    assert len(summary.recent_events) == RECENT_EVENT_LIMIT
+    assert [event["delta"] for event in xp_history(summary)][:2] == [5, 5]
+
+
+def test_rebuild_matches_incremental_updates(session):
+    alex = User(display_name="Alex")
+    bo = User(display_name="Bo")
+    session.add_all([alex, bo])
+    session.flush()
+    record_xp_events(session, _add_events(session, alex.id, [10, 20, 30]))
+    session.commit()
+    incremental = session.get(UserXPSummary, alex.id).model_dump()
+
+    assert rebuild_xp_summaries(session) == 2
+    session.commit()
+
+    rebuilt = session.get(UserXPSummary, alex.id, populate_existing=True)
+    assert rebuilt.total_xp == incremental["total_xp"] == 60
+    assert rebuilt.recent_events == incremental["recent_events"]
+    assert session.get(UserXPSummary, bo.id).total_xp == 0